@@ -4,9 +4,8 @@ Security-related middleware for tracking API activity.
 import json
 import time
 import logging
-import asyncio
-import inspect
-from django.utils.deprecation import MiddlewareMixin
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject, empty
 from django.conf import settings
 from django.urls import resolve, Resolver404
 from django.utils import timezone
@@ -18,9 +17,17 @@ class APIActivityMiddleware:
     Middleware to track API activity for security monitoring.
     Logs request patterns, response times, and suspicious activity.
     """
+    # Django reads these from the class when building the middleware chain
+    sync_capable = True
+    async_capable = True
     
     def __init__(self, get_response):
         self.get_response = get_response
+        # Under ASGI Django hands us an async get_response; Django always
+        # calls __call__, so it has to return a coroutine in that case
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
         # Define paths that should be exempt from detailed logging
         self.exempt_paths = [
             '/api/auth/refresh/',
@@ -32,14 +39,14 @@ class APIActivityMiddleware:
             'password', 'token', 'key', 'secret', 'authorization',
             'current_password', 'new_password', 'credit_card', 'otp'
         ]
-        # Required for Django async compatibility
-        self.sync_capable = True
-        self.async_capable = True
     
     def __call__(self, request):
         """
         Standard synchronous request/response middleware for Django WSGI.
         """
+        if self.async_mode:
+            return self.__acall__(request)
+        
         # Store the start time for measuring response time
         request.start_time = time.time()
         
@@ -65,6 +72,13 @@ class APIActivityMiddleware:
         # Get response asynchronously
         response = await self.get_response(request)
         
+        # Views that didn't authenticate the request (DRF sets request.user)
+        # leave the lazy session user behind; resolve it without blocking
+        # the event loop before _process_response reads it
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty and hasattr(request, 'auser'):
+            request.user = await request.auser()
+        
         # Process the response
         return self._process_response(request, response)
     
@@ -128,8 +142,8 @@ class APIActivityMiddleware:
                     # Determine action type based on path and method
                     action = self._determine_action_type(request)
                     
-                    # Log to database
-                    UserActivity.log_activity(
+                    # Queue for the database; written in batches off the request path
+                    UserActivity.log_activity_async(
                         user=request.user if request.user.is_authenticated else None,
                         action=action,
                         ip_address=ip,
@@ -83,7 +83,7 @@ class CorsMiddleware:
                 
                 # Log CORS request handling
                 if origin:
-                    logger.debug(f"CORS request from origin: {origin}")
+                    logger.debug("CORS request from origin: %s", origin)
             
             # Pass the message to the original send function
             return await send(message)
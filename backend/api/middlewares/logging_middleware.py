@@ -47,11 +47,11 @@ class RequestLoggingMiddleware:
         # Extract request details
         path = scope.get('path', '')
         method = scope.get('method', '')
-        headers = dict(scope.get('headers', []))
         client = scope.get('client', ('unknown', 0))
         
         # Log the incoming request
-        logger.info(f"Request: {method} {path} from {client[0]}:{client[1]}")
+        # Lazy %-style arguments: nothing is formatted when INFO is disabled
+        logger.info("Request: %s %s from %s:%s", method, path, client[0], client[1])
         
         # Create a wrapper for the send function to intercept the response
         async def send_wrapper(message):
@@ -63,7 +63,7 @@ class RequestLoggingMiddleware:
                 duration = time.time() - start_time
                 
                 # Log the response
-                logger.info(f"Response: {status} for {method} {path} in {duration:.3f}s")
+                logger.info("Response: %s for %s %s in %.3fs", status, method, path, duration)
                 
             # Pass the message to the original send function
             return await send(message)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2025-06-02 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_loginattempt_remove_user_is_temporary_password_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['username', 'was_successful', '-timestamp'], name='api_loginat_usernam_36a81d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['ip_address', '-timestamp'], name='api_loginat_ip_addr_037def_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['-timestamp'], name='api_loginat_timesta_b7b9eb_idx'),
+        ),
+    ]
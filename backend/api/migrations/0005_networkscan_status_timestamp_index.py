@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2025-06-03 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_loginattempt_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='networkscan',
+            index=models.Index(fields=['status', '-timestamp'], name='api_network_status_fadcd4_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2025-06-04 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_networkscan_status_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read'], name='api_notific_user_id_16328d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_system', 'is_read'], name='api_notific_is_syst_f4773d_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2025-06-05 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_notificationreadstate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['-timestamp'], name='api_alert_timesta_1f875d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securitystatus',
+            index=models.Index(fields=['-timestamp'], name='api_securit_timesta_8d6df7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemmetrics',
+            index=models.Index(fields=['-timestamp'], name='api_systemm_timesta_6dbd7f_idx'),
+        ),
+    ]
@@ -17,7 +17,7 @@ from .network import NetworkDevice, NetworkConnection, NetworkScan
 from .system import SystemMetrics, Alert, SecurityStatus
 
 # Notification model
-from .notification import Notification
+from .notification import Notification, NotificationReadState
 
 # Define what's exported when doing 'from api.models import *'
 __all__ = [
@@ -32,4 +32,5 @@ __all__ = [
     'Alert',
     'SecurityStatus',
     'Notification',
+    'NotificationReadState',
 ]
@@ -5,6 +5,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from api.utils.batch_writer import BatchWriter
+
 User = get_user_model()
 
 class UserActivity(models.Model):
@@ -73,3 +75,23 @@ class UserActivity(models.Model):
         )
         
         return activity
+    
+    @classmethod
+    def log_activity_async(cls, user=None, action=None, ip_address=None, user_agent=None, details=None):
+        """
+        Queue a user activity to be logged by the background writer
+        
+        Takes the same arguments as log_activity, but only queues the row and
+        returns; the caller never waits on (or performs) the insert.
+        """
+        _activity_writer.submit(cls(
+            user=user,
+            action=action,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            details=details or {}
+        ))
+
+
+# Writes audited activity off the request path, in batches
+_activity_writer = BatchWriter(UserActivity, 'user-activity')
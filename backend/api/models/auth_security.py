@@ -1,11 +1,16 @@
 """
 Authentication security models for the everyst API.
 """
+import hashlib
+
+from django.core.cache import cache
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from api.utils.batch_writer import BatchWriter
+
 User = get_user_model()
 
 class LoginAttempt(models.Model):
@@ -20,7 +25,12 @@ class LoginAttempt(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
-    
+        indexes = [
+            models.Index(fields=['username', 'was_successful', '-timestamp']),
+            models.Index(fields=['ip_address', '-timestamp']),
+            models.Index(fields=['-timestamp']),
+        ]
+
     @classmethod
     def is_account_locked(cls, username, ip_address=None):
         """
@@ -33,35 +43,48 @@ class LoginAttempt(models.Model):
         Returns:
             (bool, datetime): A tuple containing whether the account is locked and when it will be unlocked
         """
+        # A lock is only ever set by _count_failed_attempt, so this is one cache read
+        unlock_time = cache.get(cls._lockout_cache_key('lock', username, ip_address))
+        if unlock_time and unlock_time > timezone.now():
+            return True, unlock_time
+        
+        return False, None
+    
+    @staticmethod
+    def _lockout_cache_key(prefix, username, ip_address):
+        """
+        Build a fixed-length cache key for a username/IP pair
+        """
+        digest = hashlib.sha1(f"{username}\0{ip_address or ''}".encode('utf-8')).hexdigest()
+        return f"login_{prefix}:{digest}"
+    
+    @classmethod
+    def _count_failed_attempt(cls, username, ip_address=None):
+        """
+        Count a failed attempt and lock the account once the limit is reached
+        
+        Failures are counted in a cache entry that expires after the lockout
+        window, so the check never has to aggregate LoginAttempt rows.
+        """
         # Get settings from Django settings or use defaults
         max_attempts = getattr(settings, 'MAX_LOGIN_ATTEMPTS', 5)
         lockout_duration = getattr(settings, 'ACCOUNT_LOCKOUT_DURATION', 15)  # minutes
+        window = lockout_duration * 60
         
-        # Define the window for recent attempts
-        lockout_threshold = timezone.now() - timezone.timedelta(minutes=lockout_duration)
-        
-        # Get recent failed attempts
-        recent_failed_attempts = cls.objects.filter(
-            username=username,
-            was_successful=False,
-            timestamp__gt=lockout_threshold
-        )
-        
-        # Check IP address if provided
-        if ip_address:
-            recent_failed_attempts = recent_failed_attempts.filter(ip_address=ip_address)
-        
-        # If too many failed attempts, lock the account
-        if recent_failed_attempts.count() >= max_attempts:
-            # Calculate when the account will be unlocked
-            oldest_recent_attempt = recent_failed_attempts.order_by('timestamp').first()
-            unlock_time = oldest_recent_attempt.timestamp + timezone.timedelta(minutes=lockout_duration)
-            
-            # If still in the lockout period, return True
-            if unlock_time > timezone.now():
-                return True, unlock_time
+        counter_key = cls._lockout_cache_key('failures', username, ip_address)
+        cache.add(counter_key, 0, timeout=window)
+        try:
+            failures = cache.incr(counter_key)
+        except ValueError:
+            # The counter expired between add() and incr()
+            cache.set(counter_key, 1, timeout=window)
+            failures = 1
         
-        return False, None
+        # If too many failed attempts, lock the account for the lockout duration
+        if failures >= max_attempts:
+            unlock_time = timezone.now() + timezone.timedelta(minutes=lockout_duration)
+            cache.set(cls._lockout_cache_key('lock', username, ip_address), unlock_time, timeout=window)
+            cache.delete(counter_key)
     
     @classmethod
     def record_attempt(cls, username, ip_address=None, user_agent=None, was_successful=False):
@@ -74,6 +97,9 @@ class LoginAttempt(models.Model):
             user_agent: The user agent of the client
             was_successful: Whether the login was successful
         """
+        if not was_successful:
+            cls._count_failed_attempt(username, ip_address)
+        
         cls.objects.create(
             username=username,
             ip_address=ip_address,
@@ -81,8 +107,38 @@ class LoginAttempt(models.Model):
             was_successful=was_successful
         )
         
-        # Clean up old records to prevent database bloat
+        cls._prune()
+    
+    @classmethod
+    def _prune(cls):
+        """
+        Clean up old records to prevent database bloat
+        """
         # Keep the last 1000 records
         old_records = cls.objects.order_by('-timestamp')[1000:]
         if old_records.exists():
             cls.objects.filter(pk__in=old_records.values_list('pk', flat=True)).delete()
+    
+    @classmethod
+    def record_attempt_async(cls, username, ip_address=None, user_agent=None, was_successful=False):
+        """
+        Queue a login attempt to be recorded by the background writer
+        
+        Takes the same arguments as record_attempt, but returns immediately so
+        the login response does not wait on the insert and the pruning query.
+        Failed attempts are still counted towards the lockout right away.
+        """
+        if not was_successful:
+            cls._count_failed_attempt(username, ip_address)
+        
+        _attempt_writer.submit(cls(
+            username=username,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            was_successful=was_successful
+        ))
+
+
+# Writes login attempts off the request path; each batch is followed by a
+# single prune instead of one per attempt
+_attempt_writer = BatchWriter(LoginAttempt, 'login-attempts', after_flush=LoginAttempt._prune)
@@ -134,6 +134,10 @@ class NetworkScan(BaseModel):
         ordering = ['-timestamp']
         verbose_name = "Network Scan"
         verbose_name_plural = "Network Scans"
+        indexes = [
+            # Latest completed scan lookups (scan list and topology)
+            models.Index(fields=['status', '-timestamp']),
+        ]
     
     def __str__(self):
         return f"Scan {self.id} ({self.timestamp})"
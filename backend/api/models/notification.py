@@ -1,7 +1,14 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Case, Exists, F, OuterRef, When
 from .user import User
 from .base import BaseModel
 
+# Unread counts are cached per user. System notifications are visible to
+# everyone, so changing one bumps a shared version that is part of every key.
+UNREAD_COUNT_VERSION_KEY = 'notifications:unread:version'
+UNREAD_COUNT_TIMEOUT = 300  # seconds; an upper bound in case an update is missed
+
 class Notification(BaseModel):
     """Model for storing user notifications"""
     TYPE_CHOICES = [
@@ -27,6 +34,9 @@ class Notification(BaseModel):
         indexes = [
             models.Index(fields=['user', '-timestamp']),
             models.Index(fields=['is_system', '-timestamp']),
+            # Unread counts and mark-all-as-read
+            models.Index(fields=['user', 'is_read']),
+            models.Index(fields=['is_system', 'is_read']),
         ]
     
     def __str__(self):
@@ -44,3 +54,116 @@ class Notification(BaseModel):
             'is_system': self.is_system,
             'source': self.source,
         }
+    
+    @classmethod
+    def visible_to(cls, user):
+        """
+        Get the user's own and system notifications, with read state for that user
+        
+        System notifications are shared, so whether one has been read is
+        tracked per user in NotificationReadState rather than in is_read.
+        Each row is annotated with is_read_for_user.
+        
+        The two sets are selected separately and combined with UNION ALL,
+        so each side is an index range scan rather than one OR across both
+        columns, which databases tend to plan as a full table scan. Only the
+        ids go through the union, so the result can still be filtered.
+        """
+        visible_ids = cls.objects.filter(user=user).order_by().values('pk').union(
+            cls.objects.filter(is_system=True).order_by().values('pk'),
+            all=True
+        )
+        read_by_user = NotificationReadState.objects.filter(
+            user=user,
+            notification=OuterRef('pk')
+        )
+        return cls.objects.filter(
+            pk__in=visible_ids
+        ).annotate(
+            is_read_for_user=Case(
+                When(is_system=True, is_read=False, then=Exists(read_by_user)),
+                default=F('is_read'),
+                output_field=models.BooleanField()
+            )
+        )
+    
+    @classmethod
+    def mark_read_for(cls, user, notifications):
+        """
+        Mark notifications as read for one user
+        
+        Args:
+            user: The user reading the notifications
+            notifications: A queryset from visible_to(user)
+            
+        Returns:
+            The number of notifications that became read
+        """
+        unread = notifications.filter(is_read_for_user=False)
+        
+        # The user's own notifications keep their read flag on the row
+        updated = cls.objects.filter(
+            pk__in=unread.filter(is_system=False).values('pk')
+        ).update(is_read=True)
+        
+        # System notifications only become read for this user
+        system_ids = list(unread.filter(is_system=True).values_list('pk', flat=True))
+        NotificationReadState.objects.bulk_create(
+            [NotificationReadState(user=user, notification_id=pk) for pk in system_ids],
+            batch_size=500,
+            ignore_conflicts=True
+        )
+        
+        cls.invalidate_unread_counts(user.pk)
+        return updated + len(system_ids)
+    
+    @staticmethod
+    def _unread_count_cache_key(user_id):
+        version = cache.get_or_set(UNREAD_COUNT_VERSION_KEY, 0, None)
+        return f"notifications:unread:{version}:{user_id}"
+    
+    @classmethod
+    def unread_count_for(cls, user):
+        """
+        Get the number of unread notifications visible to a user
+        
+        Counts the user's own and system notifications, answering from the
+        cache when possible.
+        """
+        key = cls._unread_count_cache_key(user.pk)
+        count = cache.get(key)
+        if count is None:
+            count = cls.visible_to(user).filter(is_read_for_user=False).count()
+            cache.set(key, count, UNREAD_COUNT_TIMEOUT)
+        return count
+    
+    @classmethod
+    def invalidate_unread_counts(cls, user_id=None):
+        """
+        Drop cached unread counts
+        
+        Args:
+            user_id: Only drop this user's count; None drops everyone's
+        """
+        if user_id is not None:
+            cache.delete(cls._unread_count_cache_key(user_id))
+            return
+        
+        try:
+            cache.incr(UNREAD_COUNT_VERSION_KEY)
+        except ValueError:
+            cache.set(UNREAD_COUNT_VERSION_KEY, 1, None)
+
+
+class NotificationReadState(BaseModel):
+    """Records that a user has read a (shared) system notification"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_read_states')
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='read_states')
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'notification'], name='unique_notification_read_state'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user} read {self.notification_id}"
@@ -1,7 +1,14 @@
+import hashlib
+
+from django.core.cache import cache
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from .base import BaseModel
 
+# Roles are a handful of rows that almost never change, so lookups by name
+# are served from the cache and dropped when a role is saved or deleted
+ROLE_CACHE_TIMEOUT = 3600
+
 
 class UserRole(models.Model):
     """
@@ -32,11 +39,43 @@ class UserRole(models.Model):
     can_view_all_data = models.BooleanField(default=False)
     
     class Meta:
-        ordering = ['приоритет']
+        ordering = ['priority']
     
     def __str__(self):
         return self.get_name_display()
     
+    @staticmethod
+    def _cache_key(name):
+        # Role names come from request data; hash them into a safe, fixed-length key
+        return f"roles:{hashlib.sha1(str(name).encode('utf-8')).hexdigest()}"
+    
+    @classmethod
+    def get_cached(cls, name):
+        """
+        Get a role by name, from the cache when possible
+        
+        invalidate_cached() only reaches other workers when the cache is
+        shared (Redis), so with the default LocMem cache a role's flags can
+        be stale for up to ROLE_CACHE_TIMEOUT. Authorization reads the role
+        from the database instead (see get_request_role).
+        
+        Raises:
+            UserRole.DoesNotExist: If there is no role with that name
+        """
+        key = cls._cache_key(name)
+        role = cache.get(key)
+        if role is None:
+            role = cls.objects.get(name=name)
+            cache.set(key, role, ROLE_CACHE_TIMEOUT)
+        return role
+    
+    @classmethod
+    def invalidate_cached(cls, name):
+        """
+        Drop a cached role (see api.signals)
+        """
+        cache.delete(cls._cache_key(name))
+    
     @classmethod
     def create_default_roles(cls):
         """Создайте роли по умолчанию, если их нет."""
@@ -14,6 +14,9 @@ class SystemMetrics(BaseModel):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp']),
+        ]
         verbose_name_plural = "System Metrics"
     
     def __str__(self):
@@ -44,6 +47,9 @@ class Alert(BaseModel):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp']),
+        ]
     
     def __str__(self):
         return f"{self.severity.upper()}: {self.title}"
@@ -60,6 +66,9 @@ class SecurityStatus(BaseModel):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp']),
+        ]
         verbose_name_plural = "Security Statuses"
     
     def __str__(self):
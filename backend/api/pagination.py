@@ -0,0 +1,17 @@
+"""
+Custom pagination classes for the everyst API.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class TimestampCursorPagination(CursorPagination):
+    """
+    Cursor pagination for append-only, time-ordered tables.
+
+    Pages are fetched with `WHERE timestamp < cursor LIMIT n` on the
+    timestamp index, so a deep page costs the same as the first one,
+    unlike an OFFSET that has to skip every earlier row.
+    """
+    ordering = '-timestamp'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
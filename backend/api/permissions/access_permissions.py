@@ -3,6 +3,51 @@ Access permissions based on user roles for the everyst API.
 """
 from rest_framework import permissions
 
+from api.models.role import UserRole
+
+
+def get_request_role(request):
+    """
+    Get the role of the user making the request, or None
+    
+    Permission classes consult the role several times per request (once
+    per composed permission, again for object checks), so it is loaded
+    once and remembered on the request. It is deliberately not served from
+    UserRole.get_cached: a revoked permission flag has to take effect on
+    the next request in every worker, not when a cache entry expires.
+    """
+    if hasattr(request, '_cached_user_role'):
+        return request._cached_user_role
+    
+    role = None
+    user = request.user
+    if user and user.is_authenticated and user.role_id is not None:
+        try:
+            role = user.role
+        except UserRole.DoesNotExist:
+            role = None
+    
+    request._cached_user_role = role
+    return role
+
+
+def is_user_manager(request):
+    """
+    Whether the requesting user's role may manage other users
+    
+    Shared by CanManageUsers and the user views, and remembered on the
+    request so the fact is worked out once.
+    """
+    if not hasattr(request, '_cached_is_user_manager'):
+        role = get_request_role(request)
+        request._cached_is_user_manager = bool(
+            role is not None and
+            (role.can_manage_users or
+             role.name in ['admin', 'owner'])
+        )
+    return request._cached_is_user_manager
+
+
 class IsOwner(permissions.BasePermission):
     """
     Permission to only allow system owners access
@@ -10,11 +55,10 @@ class IsOwner(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Check if user is authenticated and has the owner role
+        role = get_request_role(request)
         return bool(
-            request.user and
-            request.user.is_authenticated and
-            request.user.role is not None and
-            request.user.role.name == 'owner'
+            role is not None and
+            role.name == 'owner'
         )
 
 
@@ -25,11 +69,10 @@ class IsAdmin(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Check if user is authenticated and has admin or owner role
+        role = get_request_role(request)
         return bool(
-            request.user and
-            request.user.is_authenticated and
-            request.user.role is not None and
-            request.user.role.name in ['admin', 'owner']
+            role is not None and
+            role.name in ['admin', 'owner']
         )
 
 
@@ -40,11 +83,10 @@ class IsManager(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Check if user is authenticated and has manager or higher role
+        role = get_request_role(request)
         return bool(
-            request.user and
-            request.user.is_authenticated and
-            request.user.role is not None and
-            request.user.role.name in ['manager', 'admin', 'owner']
+            role is not None and
+            role.name in ['manager', 'admin', 'owner']
         )
 
 
@@ -55,13 +97,7 @@ class CanManageUsers(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Check if user is authenticated and has permission to manage users
-        return bool(
-            request.user and
-            request.user.is_authenticated and
-            request.user.role is not None and
-            (request.user.role.can_manage_users or 
-             request.user.role.name in ['admin', 'owner'])
-        )
+        return is_user_manager(request)
 
 
 class CanManageSystem(permissions.BasePermission):
@@ -71,12 +107,11 @@ class CanManageSystem(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Check if user is authenticated and has permission to manage system
+        role = get_request_role(request)
         return bool(
-            request.user and
-            request.user.is_authenticated and
-            request.user.role is not None and
-            (request.user.role.can_manage_system or 
-             request.user.role.name in ['admin', 'owner'])
+            role is not None and
+            (role.can_manage_system or 
+             role.name in ['admin', 'owner'])
         )
 
 
@@ -87,10 +122,9 @@ class CanManageNetwork(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Check if user is authenticated and has permission to manage network
+        role = get_request_role(request)
         return bool(
-            request.user and
-            request.user.is_authenticated and
-            request.user.role is not None and
-            (request.user.role.can_manage_network or 
-             request.user.role.name in ['admin', 'owner'])
+            role is not None and
+            (role.can_manage_network or 
+             role.name in ['admin', 'owner'])
         )
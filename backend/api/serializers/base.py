@@ -0,0 +1,23 @@
+"""
+Base serializer helpers for the everyst API.
+"""
+import copy
+
+
+class CachedFieldsMixin:
+    """
+    Build a serializer class's fields once and give each instance copies.
+    
+    ModelSerializer.get_fields() introspects the model every time a
+    serializer is instantiated, although the result never changes for a
+    serializer with static fields. The fields are built on first use and
+    each instance gets shallow copies, which it binds as usual.
+    """
+    _fields_cache = {}
+    
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsMixin._fields_cache.get(cls)
+        if fields is None:
+            fields = CachedFieldsMixin._fields_cache[cls] = super().get_fields()
+        return {name: copy.copy(field) for name, field in fields.items()}
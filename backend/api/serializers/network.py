@@ -3,9 +3,10 @@ Network-related serializers for the everyst API.
 """
 from rest_framework import serializers
 from api.models.network import NetworkDevice, NetworkConnection, NetworkScan
+from api.serializers.base import CachedFieldsMixin
 
 
-class NetworkDeviceSerializer(serializers.ModelSerializer):
+class NetworkDeviceSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the NetworkDevice model"""
     class Meta:
         model = NetworkDevice
@@ -50,7 +51,7 @@ class NetworkConnectionSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class NetworkScanSerializer(serializers.ModelSerializer):
+class NetworkScanSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the NetworkScan model"""
     class Meta:
         model = NetworkScan
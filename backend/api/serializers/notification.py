@@ -17,6 +17,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         # Convert timestamp to Unix timestamp in milliseconds for frontend consumption
         representation['timestamp'] = int(instance.timestamp.timestamp() * 1000)
-        # Rename is_read to read for frontend compatibility
-        representation['read'] = representation.pop('is_read')
+        # Rename is_read to read for frontend compatibility; querysets from
+        # Notification.visible_to() carry the per-user state for system notifications.
+        # The row's own flag wins otherwise, since the annotation goes stale on update
+        is_read = representation.pop('is_read')
+        if instance.is_system and not is_read:
+            is_read = getattr(instance, 'is_read_for_user', is_read)
+        representation['read'] = is_read
         return representation
@@ -9,7 +9,9 @@ class SystemMetricsSerializer(serializers.ModelSerializer):
     """Serializer for the SystemMetrics model"""
     class Meta:
         model = SystemMetrics
-        fields = '__all__'
+        fields = ('id', 'timestamp', 'cpu_usage', 'memory_usage', 'disk_usage',
+                  'network_rx', 'network_tx', 'created_at', 'updated_at')
+        read_only_fields = fields
 
 
 class AlertSerializer(serializers.ModelSerializer):
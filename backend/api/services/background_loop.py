@@ -0,0 +1,75 @@
+"""
+Shared background event loop for the everyst API.
+
+Synchronous Django views use this to hand coroutines from async services
+(such as the network scanner) to one long-lived event loop. This avoids
+creating a new thread and a new loop for every request, and tasks that a
+coroutine spawns keep running after the view has returned.
+"""
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger('background_loop')
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop():
+    """
+    Get the shared event loop, starting its thread on first use
+    
+    Returns:
+        The running asyncio event loop
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                name='background-loop',
+                daemon=True
+            ).start()
+            _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """
+    Schedule a coroutine on the shared loop without waiting for it
+    
+    Args:
+        coro: The coroutine to run
+        
+    Returns:
+        A concurrent.futures.Future for the coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future):
+    """Log coroutines that died with an exception nobody may be waiting for"""
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background task failed", exc_info=exc)
+
+
+def run(coro, timeout=None):
+    """
+    Run a coroutine on the shared loop and wait for its result
+    
+    Args:
+        coro: The coroutine to run
+        timeout: Seconds to wait before giving up (None waits forever)
+        
+    Returns:
+        The coroutine's return value
+    """
+    # The caller gets the exception, so this doesn't go through submit()'s logging
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result(timeout)
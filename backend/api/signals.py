@@ -1,10 +1,16 @@
 """
 Custom User model signal handlers for the everyst API.
 """
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from api.models.notification import Notification
+from api.models.role import UserRole
+from api.utils.auth import USERS_EXIST_CACHE_KEY, USER_COUNT_CACHE_KEY
 
 User = get_user_model()
 
@@ -22,6 +28,11 @@ def track_password_changes(sender, instance, **kwargs):
         # New user, set password_last_changed to now
         instance.password_last_changed = timezone.now()
         return
+    
+    # Saves that only write other columns can't change the password
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'password' not in update_fields:
+        return
         
     # Get the old instance from the database
     try:
@@ -47,3 +58,47 @@ def track_password_changes(sender, instance, **kwargs):
     except User.DoesNotExist:
         # Should not happen but handle it gracefully
         pass
+
+@receiver(post_save, sender=User)
+def set_users_exist_flag(sender, instance, created, **kwargs):
+    """
+    Record that users exist as soon as the first account is created
+    """
+    if not created:
+        return
+    
+    def update_cache():
+        cache.set(USERS_EXIST_CACHE_KEY, True, None)
+        cache.delete(USER_COUNT_CACHE_KEY)
+    
+    # Only once the account is really there; a rolled back signup must
+    # not close first-run registration
+    transaction.on_commit(update_cache)
+
+@receiver(post_delete, sender=User)
+def reset_users_exist_flag(sender, instance, **kwargs):
+    """
+    Forget the cached "users exist" flag when a user is deleted
+    
+    The next check goes back to the database, so deleting the last
+    account re-opens first-run registration.
+    """
+    cache.delete_many([USERS_EXIST_CACHE_KEY, USER_COUNT_CACHE_KEY])
+
+@receiver([post_save, post_delete], sender=Notification)
+def reset_unread_notification_count(sender, instance, **kwargs):
+    """
+    Drop the cached unread counts a notification change affects
+    """
+    if instance.is_system or instance.user_id is None:
+        # Visible to everyone
+        Notification.invalidate_unread_counts()
+    else:
+        Notification.invalidate_unread_counts(instance.user_id)
+
+@receiver([post_save, post_delete], sender=UserRole)
+def reset_cached_role(sender, instance, **kwargs):
+    """
+    Drop the cached copy of a role when it changes
+    """
+    UserRole.invalidate_cached(instance.name)
@@ -13,7 +13,6 @@ from typing import Dict, Any, Optional
 from django.utils import timezone
 from django.db import close_old_connections
 from asgiref.sync import sync_to_async
-from api.utils import get_system_metrics
 from api.models.notification import Notification
 from .server import sio, should_run, connected_clients
 
@@ -47,10 +46,13 @@ async def broadcast_metrics() -> None:
     
     logger.info("Starting metrics broadcast loop")
     
+    # Imported here so loading the socket handlers doesn't pull in psutil
+    from api.utils import get_system_metrics
+    
     while should_run:
         try:
-            # Get system metrics
-            metrics = get_system_metrics()
+            # Get system metrics; sampling sleeps, so keep it off the event loop
+            metrics = await asyncio.to_thread(get_system_metrics)
             
             # Check if we need to send metrics (only if clients are connected)
             if connected_clients:
@@ -200,7 +202,8 @@ async def connect(sid, environ):
     """
     # Send initial metrics to the new client
     try:
-        metrics = get_system_metrics()
+        from api.utils import get_system_metrics
+        metrics = await asyncio.to_thread(get_system_metrics)
         await sio.emit('metrics_update', metrics, room=sid)
         logger.info(f"Initial metrics sent to {sid}")
     except Exception as e:
@@ -25,6 +25,9 @@ from .auth import get_user_from_sid
 # Set up logging
 logger = logging.getLogger('socket_server.network')
 
+# Device types a client may set; built once rather than on every device update
+DEVICE_TYPES = frozenset(value for value, _ in NetworkDevice.TYPE_CHOICES)
+
 
 @sio.event
 async def get_network_map(sid: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -182,7 +185,7 @@ async def update_network_device(sid: str, data: Dict[str, Any]) -> Dict[str, Any
             if 'label' in data:
                 device.label = data['label']
                 
-            if 'type' in data and data['type'] in dict(NetworkDevice.TYPE_CHOICES):
+            if 'type' in data and data['type'] in DEVICE_TYPES:
                 device.type = data['type']
                 
             if 'tags' in data and isinstance(data['tags'], list):
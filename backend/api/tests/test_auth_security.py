@@ -0,0 +1,34 @@
+"""
+Test suite for login attempt tracking and account lockout.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.models.auth_security import LoginAttempt
+
+
+@override_settings(MAX_LOGIN_ATTEMPTS=3, ACCOUNT_LOCKOUT_DURATION=15)
+class LoginAttemptTest(TestCase):
+    def setUp(self):
+        cache.clear()
+    
+    def test_record_attempt_locks_after_max_failures(self):
+        """Test that failures recorded synchronously count towards the lockout"""
+        for _ in range(2):
+            LoginAttempt.record_attempt('alice', '10.0.0.1')
+        self.assertFalse(LoginAttempt.is_account_locked('alice', '10.0.0.1')[0])
+        
+        LoginAttempt.record_attempt('alice', '10.0.0.1')
+        locked, unlock_time = LoginAttempt.is_account_locked('alice', '10.0.0.1')
+        self.assertTrue(locked)
+        self.assertIsNotNone(unlock_time)
+        self.assertEqual(LoginAttempt.objects.filter(username='alice').count(), 3)
+        
+        # The lock is per username and address
+        self.assertFalse(LoginAttempt.is_account_locked('alice', '10.0.0.2')[0])
+    
+    def test_successful_attempts_are_not_counted(self):
+        """Test that successful logins don't count towards the lockout"""
+        for _ in range(3):
+            LoginAttempt.record_attempt('bob', '10.0.0.1', was_successful=True)
+        self.assertFalse(LoginAttempt.is_account_locked('bob', '10.0.0.1')[0])
@@ -0,0 +1,35 @@
+"""
+Test suite for the background batch writer.
+"""
+from django.test import TransactionTestCase
+
+from api.models.auth_security import LoginAttempt
+from api.utils.batch_writer import BatchWriter
+
+
+class BatchWriterTest(TransactionTestCase):
+    def wait_for(self, writer):
+        # The worker runs jobs in order, so a no-op job finishes after any pending flush
+        writer._executor.submit(lambda: None).result(timeout=5)
+    
+    def test_queued_instances_are_written_in_one_batch(self):
+        """Test that everything queued before the worker runs is inserted"""
+        flushes = []
+        writer = BatchWriter(LoginAttempt, 'test-writer', after_flush=lambda: flushes.append(1))
+        
+        for i in range(3):
+            writer.submit(LoginAttempt(username=f'user{i}'))
+        self.wait_for(writer)
+        
+        self.assertEqual(LoginAttempt.objects.count(), 3)
+        self.assertGreaterEqual(len(flushes), 1)
+        self.assertLessEqual(len(flushes), 3)
+    
+    def test_failed_batch_is_logged(self):
+        """Test that a failing insert is logged instead of raised"""
+        writer = BatchWriter(LoginAttempt, 'test-writer')
+        
+        with self.assertLogs('batch_writer', level='ERROR'):
+            # username is NOT NULL
+            writer.submit(LoginAttempt(username=None))
+            self.wait_for(writer)
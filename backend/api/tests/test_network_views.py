@@ -0,0 +1,194 @@
+"""
+Test suite for network API views.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from api.models.network import NetworkDevice, NetworkConnection, NetworkScan
+from api.views import network_tools
+
+User = get_user_model()
+
+class NetworkViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Create test user
+        cls.user = User.objects.create_user(
+            username='netadmin',
+            email='netadmin@example.com',
+            password='complexpassword123'
+        )
+        
+        # Create a small network of devices and connections
+        cls.devices = [
+            NetworkDevice.objects.create(label=f'Device {i}', ip=f'192.168.1.{i}', status='online')
+            for i in range(1, 5)
+        ]
+        for source, target in zip(cls.devices, cls.devices[1:]):
+            NetworkConnection.objects.create(source=source, target=target)
+        
+        cls.scan = NetworkScan.objects.create(status='completed', ip_range='192.168.1.0/24')
+    
+    def setUp(self):
+        self.client = APIClient()
+        
+        # Authenticate
+        self.client.force_authenticate(user=self.user)
+    
+    def test_list_connections_query_count(self):
+        """Listing connections must not issue a query per connection"""
+        # One COUNT for pagination, one SELECT for the page
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('networkconnection-list'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+    
+    def test_network_topology_query_count(self):
+        """Topology is built from a fixed number of queries"""
+        # Devices, connections and latest scan
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('network-topology'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['devices']), 4)
+        self.assertEqual(len(response.data['connections']), 3)
+        self.assertEqual(response.json()['lastScan']['id'], str(self.scan.id))
+    
+    def test_ignore_device_is_single_update(self):
+        """Ignoring a device is one UPDATE without loading the row"""
+        device = self.devices[0]
+        
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('networkdevice-ignore', args=[device.id]))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        device.refresh_from_db()
+        self.assertTrue(device.is_ignored)
+        
+        response = self.client.post(reverse('networkdevice-unignore', args=[device.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        device.refresh_from_db()
+        self.assertFalse(device.is_ignored)
+    
+    def test_ignore_unknown_device(self):
+        """Ignoring a missing device returns 404"""
+        response = self.client.post(reverse('networkdevice-ignore', args=['00000000-0000-0000-0000-000000000000']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_set_status(self):
+        """Setting a device status validates the value"""
+        device = self.devices[1]
+        url = reverse('networkdevice-set-status', args=[device.id])
+        
+        response = self.client.post(url, {'status': 'offline'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'offline')
+        
+        response = self.client.post(url, {'status': 'bogus'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_bulk_ignore_devices(self):
+        """Bulk ignore updates every listed device in one query"""
+        ids = [str(device.id) for device in self.devices[:3]]
+        url = reverse('networkdevice-bulk-ignore')
+        
+        with self.assertNumQueries(1):
+            response = self.client.post(url, {'ids': ids}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(NetworkDevice.objects.filter(is_ignored=True).count(), 3)
+        
+        response = self.client.post(url, {'ids': ids, 'is_ignored': False}, format='json')
+        self.assertEqual(response.data['updated'], 3)
+        self.assertFalse(NetworkDevice.objects.filter(is_ignored=True).exists())
+        
+        response = self.client.post(url, {'ids': ['not-a-uuid']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class NetworkToolsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='tooluser',
+            email='tooluser@example.com',
+            password='complexpassword123'
+        )
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+    
+    def _take_all_command_slots(self):
+        for _ in range(network_tools.MAX_CONCURRENT_COMMANDS):
+            self.assertTrue(network_tools._command_slots.acquire(blocking=False))
+            self.addCleanup(network_tools._command_slots.release)
+    
+    def test_tool_over_limit_returns_429(self):
+        """A tool request with every command slot taken is throttled, not run"""
+        self._take_all_command_slots()
+        
+        response = self.client.post(reverse('ping-tool'), {'target': '127.0.0.1'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], str(network_tools.COMMAND_RETRY_AFTER))
+        self.assertIn(network_tools.COMMANDS_BUSY_MESSAGE, response.data['detail'])
+    
+    async def test_stream_sends_output_before_command_exits(self):
+        """Streamed output reaches the client while the command is still running"""
+        marker_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, marker_dir)
+        marker = os.path.join(marker_dir, 'release')
+        # Prints one line, then blocks until the test has read it
+        script = (
+            "import os, time\n"
+            "print('first', flush=True)\n"
+            f"while not os.path.exists({marker!r}):\n"
+            "    time.sleep(0.01)\n"
+            "print('second', flush=True)\n"
+        )
+        response = network_tools.stream_command([sys.executable, '-c', script], timeout=10)
+        content = response.streaming_content
+        
+        first = await asyncio.wait_for(anext(content), timeout=5)
+        self.assertEqual(first, b'first\n')
+        
+        open(marker, 'w').close()
+        rest = [chunk async for chunk in content]
+        self.assertEqual(rest, [b'second\n'])
+    
+    async def test_stream_kills_command_on_disconnect(self):
+        """Closing the stream early kills the command and frees its slot"""
+        script = "import os, time\nprint(os.getpid(), flush=True)\ntime.sleep(30)\n"
+        output = network_tools._iter_command_output([sys.executable, '-c', script], timeout=10)
+        
+        pid = int(await asyncio.wait_for(anext(output), timeout=5))
+        await asyncio.wait_for(output.aclose(), timeout=5)
+        
+        with self.assertRaises(ProcessLookupError):
+            os.kill(pid, 0)
+        
+        # Every slot is free again
+        for _ in range(network_tools.MAX_CONCURRENT_COMMANDS):
+            self.assertTrue(network_tools._command_slots.acquire(blocking=False))
+        for _ in range(network_tools.MAX_CONCURRENT_COMMANDS):
+            network_tools._command_slots.release()
+    
+    def test_stream_over_limit_returns_429(self):
+        """A streamed tool request with every command slot taken is throttled"""
+        self._take_all_command_slots()
+        
+        response = self.client.post(reverse('traceroute-tool'), {'target': '127.0.0.1', 'stream': True}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], str(network_tools.COMMAND_RETRY_AFTER))
@@ -1,20 +1,23 @@
 """
 Test suite for notification API views and serializers.
 """
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from api.models.role import UserRole
-from api.models.notification import Notification
+from api.models.notification import Notification, NotificationReadState
 from api.serializers.notification import NotificationSerializer
+from api.views.notification import MAX_MARK_AS_READ_IDS
 
 User = get_user_model()
 
 class NotificationViewsTest(TestCase):
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
         
         # Create a user role for testing
         self.role = UserRole.objects.create(
@@ -41,16 +44,16 @@ class NotificationViewsTest(TestCase):
             user=self.user,
             title="Test Notification 1",
             message="This is test notification 1",
-            level="info",
-            read=False
+            type="info",
+            is_read=False
         )
         
         self.notification2 = Notification.objects.create(
             user=self.user,
             title="Test Notification 2",
             message="This is test notification 2",
-            level="warning",
-            read=False
+            type="warning",
+            is_read=False
         )
         
         # Authenticate
@@ -65,12 +68,12 @@ class NotificationViewsTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Assert correct number of notifications returned
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         
         # Verify notification data
-        notification_ids = [item['id'] for item in response.data]
-        self.assertIn(self.notification1.id, notification_ids)
-        self.assertIn(self.notification2.id, notification_ids)
+        notification_ids = [item['id'] for item in response.data['results']]
+        self.assertIn(str(self.notification1.id), notification_ids)
+        self.assertIn(str(self.notification2.id), notification_ids)
     
     def test_create_notification(self):
         """Test creating a notification"""
@@ -78,8 +81,8 @@ class NotificationViewsTest(TestCase):
         data = {
             'title': 'New Test Notification',
             'message': 'This is a new test notification',
-            'level': 'success',
-            'read': False
+            'type': 'success',
+            'is_read': False
         }
         
         response = self.client.post(url, data, format='json')
@@ -90,7 +93,7 @@ class NotificationViewsTest(TestCase):
         # Verify notification was created with correct data
         self.assertEqual(response.data['title'], data['title'])
         self.assertEqual(response.data['message'], data['message'])
-        self.assertEqual(response.data['level'], data['level'])
+        self.assertEqual(response.data['type'], data['type'])
         
         # Check that it was saved to database
         self.assertTrue(Notification.objects.filter(title=data['title']).exists())
@@ -104,14 +107,14 @@ class NotificationViewsTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Verify notification data
-        self.assertEqual(response.data['id'], self.notification1.id)
+        self.assertEqual(response.data['id'], str(self.notification1.id))
         self.assertEqual(response.data['title'], self.notification1.title)
         self.assertEqual(response.data['message'], self.notification1.message)
     
     def test_mark_notification_as_read(self):
         """Test marking a notification as read"""
         url = reverse('notification-detail', args=[self.notification1.id])
-        data = {'read': True}
+        data = {'is_read': True}
         
         response = self.client.patch(url, data, format='json')
         
@@ -123,7 +126,7 @@ class NotificationViewsTest(TestCase):
         
         # Refresh from database and check
         self.notification1.refresh_from_db()
-        self.assertTrue(self.notification1.read)
+        self.assertTrue(self.notification1.is_read)
     
     def test_delete_notification(self):
         """Test deleting a notification"""
@@ -138,7 +141,7 @@ class NotificationViewsTest(TestCase):
     
     def test_mark_all_as_read(self):
         """Test mark all notifications as read endpoint"""
-        url = reverse('mark-all-notifications-read')
+        url = reverse('notification-mark-all-as-read')
         response = self.client.post(url)
         
         # Assert response status code is 200 OK
@@ -147,5 +150,128 @@ class NotificationViewsTest(TestCase):
         # Check all notifications are marked as read
         self.notification1.refresh_from_db()
         self.notification2.refresh_from_db()
-        self.assertTrue(self.notification1.read)
-        self.assertTrue(self.notification2.read)
+        self.assertTrue(self.notification1.is_read)
+        self.assertTrue(self.notification2.is_read)
+
+
+class NotificationReadStateTest(TestCase):
+    """Per-user read state for shared system notifications"""
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        
+        self.user_a = User.objects.create_user(
+            username='usera',
+            email='usera@example.com',
+            password='complexpassword123'
+        )
+        self.user_b = User.objects.create_user(
+            username='userb',
+            email='userb@example.com',
+            password='complexpassword123'
+        )
+        
+        self.system_notification = Notification.objects.create(
+            title="System Notification",
+            message="Shown to everyone",
+            type="warning",
+            is_system=True
+        )
+        self.notification_a = Notification.objects.create(
+            user=self.user_a,
+            title="Notification A",
+            message="Only for user A"
+        )
+        self.notification_b = Notification.objects.create(
+            user=self.user_b,
+            title="Notification B",
+            message="Only for user B"
+        )
+    
+    def _unread_count(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['count']
+    
+    def _read_flags(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id']: item['read'] for item in response.data['results']}
+    
+    def _mark_as_read(self, user, ids):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse('notification-mark-as-read'), {'ids': ids}, format='json')
+    
+    def test_system_notification_read_state_is_per_user(self):
+        """Test that reading a system notification doesn't mark it read for others"""
+        self.assertEqual(self._unread_count(self.user_b), 2)
+        
+        response = self._mark_as_read(self.user_a, [str(self.system_notification.id)])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+        
+        self.assertTrue(self._read_flags(self.user_a)[str(self.system_notification.id)])
+        self.assertFalse(self._read_flags(self.user_b)[str(self.system_notification.id)])
+        self.assertEqual(self._unread_count(self.user_b), 2)
+        
+        # The shared row itself is left alone
+        self.system_notification.refresh_from_db()
+        self.assertFalse(self.system_notification.is_read)
+    
+    def test_mark_all_as_read_only_touches_own_notifications(self):
+        """Test that mark all as read leaves other users' notifications alone"""
+        self.client.force_authenticate(user=self.user_a)
+        response = self.client.post(reverse('notification-mark-all-as-read'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        
+        self.notification_a.refresh_from_db()
+        self.notification_b.refresh_from_db()
+        self.system_notification.refresh_from_db()
+        self.assertTrue(self.notification_a.is_read)
+        self.assertFalse(self.notification_b.is_read)
+        self.assertFalse(self.system_notification.is_read)
+        
+        read_states = NotificationReadState.objects.all()
+        self.assertEqual(read_states.count(), 1)
+        self.assertEqual(read_states[0].user, self.user_a)
+        self.assertEqual(read_states[0].notification, self.system_notification)
+    
+    def test_mark_as_read_ignores_other_users_notifications(self):
+        """Test that marking another user's notification updates nothing"""
+        response = self._mark_as_read(self.user_a, [str(self.notification_b.id)])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 0)
+        
+        self.notification_b.refresh_from_db()
+        self.assertFalse(self.notification_b.is_read)
+        self.assertFalse(NotificationReadState.objects.exists())
+    
+    def test_unread_count_invalidated_after_marking(self):
+        """Test that the cached unread count drops once notifications are read"""
+        self.assertEqual(self._unread_count(self.user_a), 2)
+        
+        self._mark_as_read(self.user_a, [str(self.notification_a.id)])
+        self.assertEqual(self._unread_count(self.user_a), 1)
+        
+        self._mark_as_read(self.user_a, [str(self.system_notification.id)])
+        self.assertEqual(self._unread_count(self.user_a), 0)
+    
+    def test_mark_as_read_rejects_invalid_ids(self):
+        """Test that malformed ids are rejected"""
+        response = self._mark_as_read(self.user_a, ['not-a-uuid'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.notification_a.refresh_from_db()
+        self.assertFalse(self.notification_a.is_read)
+    
+    def test_mark_as_read_rejects_too_many_ids(self):
+        """Test that oversized id lists are rejected"""
+        ids = [str(self.notification_a.id)] * (MAX_MARK_AS_READ_IDS + 1)
+        response = self._mark_as_read(self.user_a, ids)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.notification_a.refresh_from_db()
+        self.assertFalse(self.notification_a.is_read)
@@ -90,7 +90,7 @@ class TestMetricsEvents:
     """Test metrics-related Socket.IO functionality."""
     
     @pytest.mark.asyncio
-    @patch('api.sockets.metrics.get_system_metrics')
+    @patch('api.utils.get_system_metrics')
     @patch('api.sockets.metrics.sio.emit')
     async def test_initial_metrics(self, mock_emit, mock_get_metrics):
         """Test that initial metrics are sent on connection."""
@@ -1,7 +1,9 @@
 """
 Test suite for API views.
 """
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -13,11 +15,10 @@ from api.models.notification import Notification
 User = get_user_model()
 
 class AuthViewsTest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        
+    @classmethod
+    def setUpTestData(cls):
         # Create a user role for testing
-        self.role = UserRole.objects.create(
+        cls.role = UserRole.objects.create(
             name='test_role',
             description='Test Role',
             priority=50,
@@ -27,6 +28,9 @@ class AuthViewsTest(TestCase):
             can_view_all_data=True
         )
     
+    def setUp(self):
+        self.client = APIClient()
+    
     def test_health_check_view(self):
         """Test the health check endpoint"""
         response = self.client.get(reverse('health-check'))
@@ -58,32 +62,83 @@ class AuthViewsTest(TestCase):
         self.assertEqual(user.last_name, 'User')
 
 
-class UserViewsTest(TestCase):
+class FirstRunCheckTest(TestCase):
     def setUp(self):
-        self.client = APIClient()
+        # The users-exist flag lives in the cache, which outlives test transactions
+        cache.clear()
+    
+    async def test_first_run_without_users(self):
+        """Test that a fresh install asks for registration"""
+        response = await self.async_client.get(reverse('first-run-check'))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+    
+    async def test_first_run_with_users(self):
+        """Test that an installed system shows the login page"""
+        await User.objects.acreate(username='existing', email='existing@example.com')
         
-        # Create roles
-        UserRole.create_default_roles()
-        self.owner_role = UserRole.objects.get(name='owner')
-        self.user_role = UserRole.objects.get(name='user')
+        response = await self.async_client.get(reverse('first-run-check'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    async def test_first_run_rejects_other_methods(self):
+        """Test that only GET is allowed"""
+        response = await self.async_client.post(reverse('first-run-check'))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+    
+    @override_settings(DEBUG=True)
+    def test_asgi_middleware_chain_is_async(self):
+        """Test that no middleware forces ASGI requests onto a worker thread"""
+        with self.assertNoLogs('django.request', level='DEBUG'):
+            ASGIHandler()
+
+
+class UserViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Create roles (create_default_roles uses the localized role names,
+        # while the views check for 'owner' and 'admin')
+        cls.owner_role = UserRole.objects.create(
+            name='owner',
+            description='Owner Role',
+            priority=100,
+            can_manage_users=True,
+            can_manage_system=True,
+            can_manage_network=True,
+            can_view_all_data=True
+        )
+        cls.admin_role = UserRole.objects.create(
+            name='admin',
+            description='Admin Role',
+            priority=90,
+            can_manage_users=True,
+            can_manage_system=True
+        )
+        cls.user_role = UserRole.objects.create(
+            name='user',
+            description='User Role',
+            priority=10
+        )
         
         # Create users
-        self.admin_user = User.objects.create_user(
+        cls.admin_user = User.objects.create_user(
             username='admin',
             email='admin@example.com',
             password='adminpass',
-            role=self.owner_role,
+            role=cls.owner_role,
             is_staff=True,
             is_superuser=True
         )
         
-        self.regular_user = User.objects.create_user(
+        cls.regular_user = User.objects.create_user(
             username='regular',
             email='regular@example.com',
             password='regularpass',
-            role=self.user_role
+            role=cls.user_role
         )
     
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+    
     def test_me_endpoint(self):
         """Test the 'me' endpoint for retrieving current user info"""
         # Login as regular user
@@ -101,40 +156,164 @@ class UserViewsTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['username'], 'admin')
         self.assertEqual(response.data['role_details']['name'], 'owner')
+    
+    def test_me_etag(self):
+        """Test that the 'me' endpoint sends a private, revalidated ETag"""
+        self.client.force_authenticate(user=self.regular_user)
+        
+        response = self.client.get(reverse('user-me'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+    
+    def test_me_not_modified(self):
+        """Test that a matching If-None-Match gets a 304"""
+        self.client.force_authenticate(user=self.regular_user)
+        etag = self.client.get(reverse('user-me'))['ETag']
+        
+        response = self.client.get(reverse('user-me'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+    
+    def test_me_etag_changes_with_profile(self):
+        """Test that editing the profile changes the ETag"""
+        self.client.force_authenticate(user=self.regular_user)
+        etag = self.client.get(reverse('user-me'))['ETag']
+        
+        self.regular_user.first_name = 'Regular'
+        self.regular_user.save(update_fields=['first_name'])
+        
+        response = self.client.get(reverse('user-me'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['first_name'], 'Regular')
+    
+    def test_me_etag_changes_with_role(self):
+        """Test that assigning another role, or changing the role, changes the ETag"""
+        self.client.force_authenticate(user=self.regular_user)
+        etag = self.client.get(reverse('user-me'))['ETag']
+        
+        self.regular_user.role = self.admin_role
+        self.regular_user.save(update_fields=['role'])
+        
+        response = self.client.get(reverse('user-me'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+        
+        self.admin_role.can_manage_network = True
+        self.admin_role.save()
+        
+        # Requests normally load the user afresh
+        self.client.force_authenticate(user=User.objects.get(pk=self.regular_user.pk))
+        response = self.client.get(reverse('user-me'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_retrieve_own_profile(self):
+        """Test that a user can retrieve their own profile but not someone else's"""
+        self.client.force_authenticate(user=self.regular_user)
+        
+        response = self.client.get(reverse('user-detail', args=[self.regular_user.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], 'regular')
+        
+        response = self.client.get(reverse('user-detail', args=[self.admin_user.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_list_users_by_role(self):
+        """Test that only user managers see every user"""
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.data['count'], 2)
+    
+    def test_revoked_role_flag_applies_immediately(self):
+        """Test that permission checks don't use a stale cached role"""
+        staff_role = UserRole.objects.create(
+            name='staff',
+            description='Staff Role',
+            priority=50,
+            can_manage_users=True
+        )
+        self.regular_user.role = staff_role
+        self.regular_user.save(update_fields=['role'])
+        
+        self.client.force_authenticate(user=User.objects.get(pk=self.regular_user.pk))
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.data['count'], 2)
+        
+        # Prime the role cache, then revoke the flag the way another worker
+        # would see it: in the database, without this process's invalidation
+        UserRole.get_cached('staff')
+        UserRole.objects.filter(name='staff').update(can_manage_users=False)
+        
+        self.client.force_authenticate(user=User.objects.get(pk=self.regular_user.pk))
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.data['count'], 1)
+    
+    def test_set_role_updates_staff_flags(self):
+        """Test that setting a role grants the staff flags that go with it"""
+        self.client.force_authenticate(user=self.admin_user)
+        url = reverse('user-set-role', args=[self.regular_user.pk])
+        
+        response = self.client.post(url, {'role': 'admin'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.regular_user.refresh_from_db()
+        self.assertEqual(self.regular_user.role_id, 'admin')
+        self.assertTrue(self.regular_user.is_staff)
+        self.assertFalse(self.regular_user.is_superuser)
+        
+        response = self.client.post(url, {'role': 'user'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.regular_user.refresh_from_db()
+        self.assertFalse(self.regular_user.is_staff)
+        
+        # Regular users can't manage roles
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.post(url, {'role': 'admin'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
 class NotificationViewsTest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        
+    @classmethod
+    def setUpTestData(cls):
         # Create user
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass'
         )
         
         # Create notifications
-        self.notification1 = Notification.objects.create(
-            user=self.user,
+        cls.notification1 = Notification.objects.create(
+            user=cls.user,
             title='Notification 1',
             message='This is notification 1',
             type='info'
         )
         
-        self.notification2 = Notification.objects.create(
-            user=self.user,
+        cls.notification2 = Notification.objects.create(
+            user=cls.user,
             title='Notification 2',
             message='This is notification 2',
             type='warning'
         )
         
-        self.system_notification = Notification.objects.create(
+        cls.system_notification = Notification.objects.create(
             title='System Notification',
             message='This is a system notification',
             type='system',
             is_system=True
         )
+    
+    def setUp(self):
+        self.client = APIClient()
         
         # Authenticate
         self.client.force_authenticate(user=self.user)
@@ -143,7 +322,7 @@ class NotificationViewsTest(TestCase):
         """Test listing notifications for the current user"""
         response = self.client.get(reverse('notification-list'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 4)  # All notifications returned from the test database
+        self.assertEqual(len(response.data['results']), 3)  # Both user notifications and the system one
     
     def test_mark_as_read(self):
         """Test marking notifications as read"""
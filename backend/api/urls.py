@@ -1,5 +1,5 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from rest_framework_simplejwt.views import TokenRefreshView as OriginalTokenRefreshView
 
 # Import views using the clean exports from modular structure
@@ -16,7 +16,7 @@ from .views import (
     
     # System views
     SystemMetricsViewSet, AlertViewSet, 
-    SecurityStatusViewSet, get_current_metrics,
+    SecurityStatusViewSet, get_current_metrics, server_info,
     
     # Notification views
     NotificationViewSet,
@@ -30,18 +30,20 @@ from .views import (
 from .views.auth_token import TokenObtainPairView, TokenRefreshView
 from .views.logout import LogoutView, LogoutAllView
 
-router = DefaultRouter()
-router.register(r'metrics', SystemMetricsViewSet)
-router.register(r'alerts', AlertViewSet)
-router.register(r'security', SecurityStatusViewSet)
-router.register(r'users', UserViewSet)
-router.register(r'roles', UserRoleViewSet)
+# SimpleRouter: the browsable API root view is not used by the frontend.
+# Explicit basenames avoid deriving them from each viewset's queryset.
+router = SimpleRouter()
+router.register(r'metrics', SystemMetricsViewSet, basename='metrics')
+router.register(r'alerts', AlertViewSet, basename='alert')
+router.register(r'security', SecurityStatusViewSet, basename='securitystatus')
+router.register(r'users', UserViewSet, basename='user')
+router.register(r'roles', UserRoleViewSet, basename='userrole')
 router.register(r'notifications', NotificationViewSet, basename='notification')
 
 # Network routes
-router.register(r'network/devices', NetworkDeviceViewSet)
-router.register(r'network/connections', NetworkConnectionViewSet)
-router.register(r'network/scans', NetworkScanViewSet)
+router.register(r'network/devices', NetworkDeviceViewSet, basename='networkdevice')
+router.register(r'network/connections', NetworkConnectionViewSet, basename='networkconnection')
+router.register(r'network/scans', NetworkScanViewSet, basename='networkscan')
 
 urlpatterns = [
     path('health/', HealthCheckView.as_view(), name='health-check'),
@@ -72,6 +74,7 @@ urlpatterns = [
     
     # System metrics endpoints
     path('system/metrics/current/', get_current_metrics, name='current-metrics'),
+    path('system/server-info/', server_info, name='server-info'),
 ]
 
 urlpatterns += router.urls
\ No newline at end of file
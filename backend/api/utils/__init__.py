@@ -4,11 +4,17 @@ All utility functions are imported and then re-exported for use across the appli
 """
 
 # System utilities
-from .system import (
-    bytes_to_gb,
-    get_system_metrics,
-    get_server_info
-)
+# Resolved from .system on first access (PEP 562): it pulls in psutil,
+# platform and subprocess, which most workers never need.
+_LAZY_SYSTEM_EXPORTS = ('bytes_to_gb', 'get_system_metrics', 'get_server_info')
+
+def __getattr__(name):
+    if name in _LAZY_SYSTEM_EXPORTS:
+        from . import system
+        value = getattr(system, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Security utilities
 from .security import generate_random_string, hash_password, verify_password
@@ -4,10 +4,18 @@ Authentication-related utilities for password management and security.
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from datetime import timedelta
 
 User = get_user_model()
 
+# Cache key for the "system has been set up" flag
+USERS_EXIST_CACHE_KEY = 'auth:users_exist'
+
+# Cache key for the number of user accounts; kept current by api.signals
+USER_COUNT_CACHE_KEY = 'auth:user_count'
+USER_COUNT_TIMEOUT = 3600  # seconds; an upper bound in case an update is missed
+
 def is_password_expired(user):
     """
     Check if a user's password has expired
@@ -64,3 +72,54 @@ def should_change_password(user):
     # Add any other conditions here
     
     return False, None
+
+def users_exist():
+    """
+    Check whether any user account exists
+    
+    Once the first account is created this never changes back in normal
+    operation, so a positive answer is cached without expiry and the
+    registration/first-run probes stop hitting the database. The flag is
+    cleared when a user is deleted (see api.signals).
+    
+    Returns:
+        bool: True if at least one user exists
+    """
+    if cache.get(USERS_EXIST_CACHE_KEY):
+        return True
+    
+    exists = User.objects.exists()
+    if exists:
+        cache.set(USERS_EXIST_CACHE_KEY, True, None)
+    return exists
+
+async def ausers_exist():
+    """
+    Async version of users_exist(), for views served by the ASGI event loop
+    
+    Returns:
+        bool: True if at least one user exists
+    """
+    if await cache.aget(USERS_EXIST_CACHE_KEY):
+        return True
+    
+    exists = await User.objects.aexists()
+    if exists:
+        await cache.aset(USERS_EXIST_CACHE_KEY, True, None)
+    return exists
+
+def user_count():
+    """
+    Get the number of user accounts, from the cache when possible
+    
+    The cached count is dropped whenever a user is created or deleted
+    (see api.signals).
+    
+    Returns:
+        int: The number of users
+    """
+    count = cache.get(USER_COUNT_CACHE_KEY)
+    if count is None:
+        count = User.objects.count()
+        cache.set(USER_COUNT_CACHE_KEY, count, USER_COUNT_TIMEOUT)
+    return count
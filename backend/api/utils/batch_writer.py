@@ -0,0 +1,74 @@
+"""
+Background batch inserts for write-heavy audit models.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger('batch_writer')
+
+
+class BatchWriter:
+    """
+    Persist model instances from a single background thread, in batches.
+    
+    submit() only queues an unsaved instance and returns; it never touches
+    the database. Everything queued by the time the worker runs is written
+    with one bulk insert, so a burst of requests costs one round of writes
+    instead of one per row. One worker keeps the inserts (and after_flush)
+    strictly sequential.
+    """
+    
+    def __init__(self, model, name, after_flush=None, batch_size=500):
+        """
+        Args:
+            model: The model class the queued instances belong to
+            name: Used for the worker thread name and in log messages
+            after_flush: Optional callable run on the worker after each batch
+            batch_size: Maximum rows per INSERT statement
+        """
+        self.model = model
+        self.name = name
+        self.after_flush = after_flush
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+    
+    def submit(self, instance):
+        """
+        Queue an unsaved instance to be inserted by the worker
+        """
+        with self._lock:
+            self._pending.append(instance)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        self._executor.submit(self._flush)
+    
+    def _flush(self):
+        """
+        Write every queued instance from the worker thread
+        """
+        with self._lock:
+            self._flush_scheduled = False
+            batch = list(self._pending)
+            self._pending.clear()
+        
+        if not batch:
+            return
+        
+        try:
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if self.after_flush is not None:
+                self.after_flush()
+        except Exception as e:
+            logger.error("%s: failed to write %d rows: %s", self.name, len(batch), e)
+        finally:
+            # The worker thread owns its own connection; don't leak it
+            close_old_connections()
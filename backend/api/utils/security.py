@@ -5,6 +5,8 @@ Includes functions for password hashing, verification, and generating secure tok
 import secrets
 import string
 import hashlib
+import hmac
+import base64
 import binascii
 import os
 
@@ -16,30 +18,71 @@ def generate_random_string(length=12):
     secure_string = ''.join(secrets.choice(characters) for _ in range(length))
     return secure_string
 
+# PBKDF2 parameters for hash_password()
+PASSWORD_HASH_ALGORITHM = 'pbkdf2_sha512'
+PASSWORD_HASH_ITERATIONS = 100000
+PASSWORD_HASH_LENGTH = 128
+
 def hash_password(password):
     """
-    Hash a password for storing using PBKDF2 with a random salt
+    Hash a password for storing using PBKDF2 with a random salt.
+    
+    The result is encoded as algorithm$iterations$salt$hash, with the salt
+    and hash base64-encoded.
     """
     # Generate a random salt
-    salt = hashlib.sha256(os.urandom(60)).hexdigest().encode('ascii')
+    salt = os.urandom(32)
     
     # Hash password with salt
     password_hash = hashlib.pbkdf2_hmac(
         'sha512',
         password.encode('utf-8'),
         salt,
-        100000,  # number of iterations
-        dklen=128  # length of the derived key
+        PASSWORD_HASH_ITERATIONS,
+        dklen=PASSWORD_HASH_LENGTH
     )
     
-    # Format as salt:hash
-    password_hash = binascii.hexlify(password_hash)
-    return (salt + password_hash).decode('ascii')
+    return '$'.join((
+        PASSWORD_HASH_ALGORITHM,
+        str(PASSWORD_HASH_ITERATIONS),
+        base64.b64encode(salt).decode('ascii'),
+        base64.b64encode(password_hash).decode('ascii'),
+    ))
 
 def verify_password(stored_password, provided_password):
     """
     Verify a stored password against a provided password
     """
+    if '$' not in stored_password:
+        return _verify_legacy_password(stored_password, provided_password)
+    
+    try:
+        algorithm, iterations, salt, stored_hash = stored_password.split('$')
+        if algorithm != PASSWORD_HASH_ALGORITHM:
+            return False
+        salt = base64.b64decode(salt)
+        stored_hash = base64.b64decode(stored_hash)
+        iterations = int(iterations)
+    except (ValueError, binascii.Error):
+        return False
+    
+    # Hash the provided password with the extracted salt
+    password_hash = hashlib.pbkdf2_hmac(
+        'sha512',
+        provided_password.encode('utf-8'),
+        salt,
+        iterations,
+        dklen=len(stored_hash)
+    )
+    
+    # Compare the stored hash with the newly calculated hash
+    return hmac.compare_digest(password_hash, stored_hash)
+
+def _verify_legacy_password(stored_password, provided_password):
+    """
+    Verify a password stored in the old format: 64 hex chars of salt
+    followed by the hex-encoded hash
+    """
     # Extract salt
     salt = stored_password[:64]
     
@@ -51,12 +94,12 @@ def verify_password(stored_password, provided_password):
         'sha512',
         provided_password.encode('utf-8'),
         salt.encode('ascii'),
-        100000,  # number of iterations
-        dklen=128  # length of the derived key
+        PASSWORD_HASH_ITERATIONS,
+        dklen=PASSWORD_HASH_LENGTH
     )
     
     # Format as hash
     password_hash = binascii.hexlify(password_hash).decode('ascii')
     
     # Compare the stored hash with the newly calculated hash
-    return password_hash == stored_hash
+    return hmac.compare_digest(password_hash, stored_hash)
@@ -4,16 +4,77 @@ Includes functions for collecting system metrics and server information.
 """
 import psutil
 import time
-from datetime import datetime
-import os
 import socket
 import platform
 import subprocess
+import threading
+
+# Private IP is static for the lifetime of the process, so resolve it once
+_private_ip = None
+
+# Public IP lookups cost a DNS lookup plus a TLS handshake with an external
+# service, so the answer is reused for a few minutes
+PUBLIC_IP_TTL = 300
+_public_ip = None  # (ip, time.monotonic() when fetched)
+_public_ip_lock = threading.Lock()
 
 def bytes_to_gb(bytes_value):
     """Convert bytes to GB with 1 decimal place"""
     return round(bytes_value / (1024 ** 3), 1)
 
+def get_private_ip(hostname=None):
+    """
+    Get the server's private IPv4 address, resolving it only on the first call
+    """
+    global _private_ip
+    if _private_ip is not None:
+        return _private_ip
+    
+    ip = None
+    
+    # Resolve the hostname once; this may hit DNS
+    try:
+        ip = socket.getaddrinfo(hostname or socket.gethostname(), None, socket.AF_INET)[0][4][0]
+    except (socket.gaierror, OSError, IndexError):
+        ip = None
+    
+    # Hostnames often resolve to loopback; look for the first non-loopback
+    # IPv4 address on the interfaces instead
+    if not ip or ip.startswith('127.'):
+        try:
+            for addrs in psutil.net_if_addrs().values():
+                for addr in addrs:
+                    if addr.family == socket.AF_INET and not addr.address.startswith('127.'):
+                        ip = addr.address
+                        break
+                else:
+                    continue
+                break
+        except Exception:
+            pass
+    
+    _private_ip = ip or "Unknown"
+    return _private_ip
+
+def get_public_ip():
+    """
+    Get the server's public IP from an external service, reusing the answer for PUBLIC_IP_TTL seconds
+    """
+    global _public_ip
+    with _public_ip_lock:
+        if _public_ip is not None and time.monotonic() - _public_ip[1] < PUBLIC_IP_TTL:
+            return _public_ip[0]
+        
+        try:
+            # Use a simple command to get public IP
+            public_ip_cmd = "curl -s https://api.ipify.org || echo 'Unknown'"
+            public_ip = subprocess.check_output(public_ip_cmd, shell=True, timeout=5).decode('utf-8').strip()
+        except Exception:
+            public_ip = "Unknown"
+        
+        _public_ip = (public_ip, time.monotonic())
+        return public_ip
+
 def get_server_info():
     """
     Get server information like hostname, IPs, etc.
@@ -22,18 +83,10 @@ def get_server_info():
     hostname = socket.gethostname()
     
     # Get private IP
-    try:
-        private_ip = socket.gethostbyname(hostname)
-    except:
-        private_ip = "Unknown"
+    private_ip = get_private_ip(hostname)
     
-    # Get public IP (using external service)
-    try:
-        # Use a simple command to get public IP
-        public_ip_cmd = "curl -s https://api.ipify.org || echo 'Unknown'"
-        public_ip = subprocess.check_output(public_ip_cmd, shell=True).decode('utf-8').strip()
-    except:
-        public_ip = "Unknown"
+    # Get public IP (using external service, cached)
+    public_ip = get_public_ip()
     
     # Get OS information
     os_name = platform.system()
@@ -58,16 +111,140 @@ def get_server_info():
         'kernel': kernel
     }
 
+# Sampling window used to turn cumulative counters into rates
+SAMPLE_INTERVAL = 0.1
+
+# ISO 8601 UTC format for metric timestamps
+_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# CPU model speed from /proc/cpuinfo never changes, so it is parsed once
+_cpuinfo_speed = None
+
+def _read_cpuinfo_speed():
+    """
+    Get the CPU speed in GHz advertised in /proc/cpuinfo's model name (cached)
+    """
+    global _cpuinfo_speed
+    if _cpuinfo_speed is not None:
+        return _cpuinfo_speed
+    
+    speed = 0
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    # Extract speed from model name if available
+                    parts = line.split('@')
+                    if len(parts) > 1 and 'GHz' in parts[1]:
+                        speed = float(parts[1].split('GHz')[0].strip())
+                    break
+    except (OSError, ValueError):
+        speed = 0
+    
+    _cpuinfo_speed = speed
+    return _cpuinfo_speed
+
+def _read_proc_snapshot():
+    """
+    Read CPU, memory, network and uptime counters from /proc in a single pass.
+    
+    Each file is opened once and every field the metrics need is extracted
+    from it, instead of letting several psutil calls re-open the same files.
+    """
+    snapshot = {}
+    
+    # Aggregate CPU times: user nice system idle iowait irq softirq steal ...
+    with open('/proc/stat', 'r') as f:
+        times = [int(value) for value in f.readline().split()[1:9]]
+    snapshot['cpu_total'] = sum(times)
+    snapshot['cpu_idle'] = times[3] + times[4]  # idle + iowait
+    
+    # Memory values are reported in kB
+    meminfo = {}
+    with open('/proc/meminfo', 'r') as f:
+        for line in f:
+            key, value = line.split(':', 1)
+            meminfo[key] = int(value.split()[0]) * 1024
+    snapshot['meminfo'] = meminfo
+    
+    # Sum bytes received/sent over all interfaces (skip the two header lines)
+    rx = tx = 0
+    with open('/proc/net/dev', 'r') as f:
+        for line in f.readlines()[2:]:
+            fields = line.split(':', 1)[1].split()
+            rx += int(fields[0])
+            tx += int(fields[8])
+    snapshot['net_rx'] = rx
+    snapshot['net_tx'] = tx
+    
+    with open('/proc/uptime', 'r') as f:
+        snapshot['uptime'] = float(f.readline().split()[0])
+    
+    return snapshot
+
+def _collect_counters():
+    """
+    Sample CPU, memory, network and uptime over SAMPLE_INTERVAL.
+    
+    On Linux both /proc snapshots share one sleep; elsewhere psutil is used.
+    """
+    try:
+        start = _read_proc_snapshot()
+        time.sleep(SAMPLE_INTERVAL)
+        end = _read_proc_snapshot()
+    except (OSError, ValueError, IndexError, KeyError):
+        start = end = None
+    
+    if start is None:
+        cpu_usage = psutil.cpu_percent(interval=SAMPLE_INTERVAL)
+        memory = psutil.virtual_memory()
+        net_io_counters_start = psutil.net_io_counters()
+        time.sleep(SAMPLE_INTERVAL)
+        net_io_counters_end = psutil.net_io_counters()
+        return {
+            'cpu_usage': cpu_usage,
+            'memory_percent': memory.percent,
+            'memory_total': memory.total,
+            # Same definition as the /proc path below, not psutil's memory.used
+            'memory_used': memory.total - memory.available,
+            'net_rx': net_io_counters_end.bytes_recv - net_io_counters_start.bytes_recv,
+            'net_tx': net_io_counters_end.bytes_sent - net_io_counters_start.bytes_sent,
+            'uptime': time.time() - psutil.boot_time(),
+        }
+    
+    # CPU usage over the sampling window
+    total_delta = end['cpu_total'] - start['cpu_total']
+    idle_delta = end['cpu_idle'] - start['cpu_idle']
+    cpu_usage = round(100.0 * (total_delta - idle_delta) / total_delta, 1) if total_delta > 0 else 0.0
+    
+    # Memory in use is whatever isn't available (total - MemAvailable), which
+    # matches psutil's percent; older kernels without MemAvailable fall back to MemFree
+    meminfo = end['meminfo']
+    memory_total = meminfo['MemTotal']
+    memory_used = memory_total - meminfo.get('MemAvailable', meminfo['MemFree'])
+    memory_percent = round(100.0 * memory_used / memory_total, 1) if memory_total else 0.0
+    
+    return {
+        'cpu_usage': cpu_usage,
+        'memory_percent': memory_percent,
+        'memory_total': memory_total,
+        'memory_used': memory_used,
+        'net_rx': end['net_rx'] - start['net_rx'],
+        'net_tx': end['net_tx'] - start['net_tx'],
+        'uptime': end['uptime'],
+    }
+
 def get_system_metrics():
     """
-    Collect real-time system metrics using psutil with accurate system totals
+    Collect real-time system metrics with accurate system totals
     """
-    # CPU usage - use interval=None for instantaneous reading to avoid blocking
-    cpu_usage = psutil.cpu_percent(interval=0.1)
+    counters = _collect_counters()
+    
+    # CPU usage over the sampling window
+    cpu_usage = counters['cpu_usage']
     
     # Get physical CPU cores (not logical/hyperthreaded)
     cpu_count_physical = psutil.cpu_count(logical=False)
-    cpu_count_logical = psutil.cpu_count(logical=True)
     
     # Get CPU frequency (speed in GHz)
     try:
@@ -76,32 +253,14 @@ def get_system_metrics():
             cpu_speed = round(cpu_freq.current / 1000, 1)  # Convert MHz to GHz
         else:
             # Try to get CPU info from /proc/cpuinfo on Linux
-            if os.path.exists('/proc/cpuinfo'):
-                with open('/proc/cpuinfo', 'r') as f:
-                    for line in f:
-                        if line.startswith('model name'):
-                            # Extract speed from model name if available
-                            parts = line.split('@')
-                            if len(parts) > 1:
-                                try:
-                                    speed_str = parts[1].strip()
-                                    if 'GHz' in speed_str:
-                                        cpu_speed = float(speed_str.split('GHz')[0].strip())
-                                    else:
-                                        cpu_speed = 0
-                                except:
-                                    cpu_speed = 0
-                            break
-            else:
-                cpu_speed = 0
+            cpu_speed = _read_cpuinfo_speed()
     except Exception:
         cpu_speed = 0
     
     # Memory usage
-    memory = psutil.virtual_memory()
-    memory_usage = memory.percent
-    memory_total = bytes_to_gb(memory.total)  # Total physical memory in GB
-    memory_used = bytes_to_gb(memory.used)    # Used memory in GB
+    memory_usage = counters['memory_percent']
+    memory_total = bytes_to_gb(counters['memory_total'])  # Total physical memory in GB
+    memory_used = bytes_to_gb(counters['memory_used'])    # Used memory in GB
     
     # Disk usage (main disk)
     disk = psutil.disk_usage('/')
@@ -109,17 +268,12 @@ def get_system_metrics():
     disk_total = bytes_to_gb(disk.total)     # Total disk size in GB
     disk_used = bytes_to_gb(disk.used)       # Used disk space in GB
     
-    # Network usage (get bytes sent and received)
-    net_io_counters_start = psutil.net_io_counters()
-    time.sleep(0.1)  # Wait for a fraction of a second to calculate network speed
-    net_io_counters_end = psutil.net_io_counters()
-    
     # Calculate network speed (bytes/second)
-    network_rx = (net_io_counters_end.bytes_recv - net_io_counters_start.bytes_recv) * 10  # Convert to bytes/second
-    network_tx = (net_io_counters_end.bytes_sent - net_io_counters_start.bytes_sent) * 10  # Convert to bytes/second
+    network_rx = counters['net_rx'] / SAMPLE_INTERVAL
+    network_tx = counters['net_tx'] / SAMPLE_INTERVAL
     
     # System uptime
-    uptime_seconds = time.time() - psutil.boot_time()
+    uptime_seconds = counters['uptime']
     days, remainder = divmod(uptime_seconds, 86400)
     hours, remainder = divmod(remainder, 3600)
     minutes, seconds = divmod(remainder, 60)
@@ -129,11 +283,8 @@ def get_system_metrics():
         'duration': f"{int(days)}d {int(hours)}h {int(minutes)}m"
     }
     
-    # Get a timestamp for the metrics
-    timestamp = datetime.now().isoformat()
-    
-    # Get server information
-    server_info = get_server_info()
+    # Get a timestamp for the metrics (UTC, second precision)
+    timestamp = time.strftime(_TIMESTAMP_FORMAT, time.gmtime())
     
     return {
         'timestamp': timestamp,
@@ -149,5 +300,4 @@ def get_system_metrics():
         'network_rx': network_rx,
         'network_tx': network_tx,
         'uptime': uptime,
-        'server_info': server_info,
     }
@@ -28,7 +28,8 @@ from .system import (
     SystemMetricsViewSet, 
     AlertViewSet, 
     SecurityStatusViewSet, 
-    get_current_metrics
+    get_current_metrics,
+    server_info
 )
 
 # Notification views
@@ -81,6 +82,7 @@ __all__ = [
     'AlertViewSet',
     'SecurityStatusViewSet',
     'get_current_metrics',
+    'server_info',
     
     # Notification views
     'NotificationViewSet'
@@ -11,6 +11,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from api.serializers.user import UserSerializer
+from api.utils.auth import users_exist
 
 User = get_user_model()
 
@@ -48,7 +49,7 @@ class RegisterView(APIView):
 
     def post(self, request):
         # First, check if any users already exist
-        if User.objects.exists():
+        if users_exist():
             return Response(
                 {"detail": "Registration is disabled. User accounts already exist."},
                 status=status.HTTP_403_FORBIDDEN
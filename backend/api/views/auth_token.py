@@ -50,7 +50,7 @@ class TokenObtainPairView(OriginalTokenObtainPairView):
             serializer.is_valid(raise_exception=True)
             
             # Record successful login
-            LoginAttempt.record_attempt(
+            LoginAttempt.record_attempt_async(
                 username=username,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -60,11 +60,8 @@ class TokenObtainPairView(OriginalTokenObtainPairView):
             # Get the validated data
             response_data = serializer.validated_data
             
-            # Update the user's last login IP if possible
-            user = User.objects.filter(username=username).first()
-            if user and hasattr(user, 'last_login_ip'):
-                user.last_login_ip = ip_address
-                user.save(update_fields=['last_login_ip'])
+            # The serializer already authenticated the user
+            user = getattr(serializer, 'user', None)
             
             # Check if the user's password should be changed
             if user:
@@ -79,7 +76,7 @@ class TokenObtainPairView(OriginalTokenObtainPairView):
             
         except (InvalidToken, TokenError) as e:
             # Record failed login attempt
-            LoginAttempt.record_attempt(
+            LoginAttempt.record_attempt_async(
                 username=username,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -90,7 +87,7 @@ class TokenObtainPairView(OriginalTokenObtainPairView):
             return Response({"detail": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
         except Exception as e:
             # Handle validation errors
-            LoginAttempt.record_attempt(
+            LoginAttempt.record_attempt_async(
                 username=username,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -1,6 +1,7 @@
 """
 This module adds CSRF failure view and token blacklist functionality.
 """
+from django.db import transaction
 from django.shortcuts import render
 from django.utils import timezone
 from rest_framework.views import APIView
@@ -69,14 +70,20 @@ class LogoutAllView(APIView):
     def post(self, request):
         """Blacklist all refresh tokens for the user"""
         try:
-            # Get all outstanding tokens for this user
-            tokens = OutstandingToken.objects.filter(user_id=request.user.id)
+            # Get the user's outstanding tokens that are not blacklisted yet
+            tokens = OutstandingToken.objects.filter(
+                user_id=request.user.id,
+                blacklistedtoken__isnull=True
+            )
             
-            # Blacklist all tokens
-            for token in tokens:
-                # Skip already blacklisted tokens
-                if not BlacklistedToken.objects.filter(token=token).exists():
-                    BlacklistedToken.objects.create(token=token, blacklisted_at=timezone.now())
+            # Blacklist them in a single insert
+            now = timezone.now()
+            with transaction.atomic():
+                BlacklistedToken.objects.bulk_create(
+                    [BlacklistedToken(token=token, blacklisted_at=now) for token in tokens],
+                    batch_size=500,
+                    ignore_conflicts=True
+                )
             
             # Log the logout event
             logger.info(f"User {request.user.username} logged out from all devices")
@@ -1,15 +1,40 @@
+import logging
+import uuid
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
 from django.utils import timezone
 
 from ..models import NetworkDevice, NetworkConnection, NetworkScan
 from ..serializers import (
     NetworkDeviceSerializer, NetworkDeviceCreateUpdateSerializer,
-    NetworkConnectionSerializer, NetworkScanSerializer, NetworkTopologySerializer
+    NetworkConnectionSerializer, NetworkScanSerializer
+)
+from ..pagination import TimestampCursorPagination
+from ..services import background_loop
+from ..services.network_scanner import (
+    start_scan, cleanup_stale_jobs, get_active_scans, ScanOptions, ScanType
 )
-from ..services.network_scanner import start_scan, cleanup_stale_jobs, ScanOptions
+
+logger = logging.getLogger('network_scanner')
+
+# Upper bound on the ids accepted by a single bulk_ignore call
+MAX_BULK_DEVICE_IDS = 500
+
+# Statuses a device can be set to through the API
+DEVICE_STATUSES = frozenset(value for value, _ in NetworkDevice.STATUS_CHOICES)
+
+# Columns rendered without a serializer (network_topology, set_status); the
+# same fields the '__all__' model serializers emit (foreign keys come out as
+# the related id)
+DEVICE_FIELDS = tuple(field.name for field in NetworkDevice._meta.concrete_fields)
+CONNECTION_FIELDS = tuple(field.name for field in NetworkConnection._meta.concrete_fields)
+SCAN_FIELDS = tuple(field.name for field in NetworkScan._meta.concrete_fields)
 
 class NetworkDeviceViewSet(viewsets.ModelViewSet):
     """API endpoint for network devices"""
@@ -31,38 +56,70 @@ class NetworkDeviceViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def set_status(self, request, pk=None):
-        device = self.get_object()
-        status = request.data.get('status')
+        new_status = request.data.get('status')
         
-        if not status or status not in ['online', 'offline', 'warning', 'error']:
+        if not isinstance(new_status, str) or new_status not in DEVICE_STATUSES:
             return Response(
                 {'error': 'Valid status required (online, offline, warning, error)'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        device.status = status
-        device.save()
+        device = self.get_object()
+        device.status = new_status
+        device.save(update_fields=['status', 'updated_at'])
         
-        return Response(self.get_serializer(device).data)
+        # Echo the device as NetworkDeviceSerializer would, without building one
+        return Response({name: getattr(device, name) for name in DEVICE_FIELDS})
+    
+    def _set_ignored(self, pk, is_ignored):
+        # Single UPDATE; the device itself isn't needed in the response
+        try:
+            updated = self.get_queryset().filter(pk=pk).update(
+                is_ignored=is_ignored,
+                updated_at=timezone.now()
+            )
+        except (TypeError, ValueError, ValidationError):
+            updated = 0
+        if not updated:
+            raise Http404
     
     @action(detail=True, methods=['post'])
     def ignore(self, request, pk=None):
-        device = self.get_object()
-        device.is_ignored = True
-        device.save()
+        self._set_ignored(pk, True)
         return Response({'status': 'device ignored'})
     
     @action(detail=True, methods=['post'])
     def unignore(self, request, pk=None):
-        device = self.get_object()
-        device.is_ignored = False
-        device.save()
+        self._set_ignored(pk, False)
         return Response({'status': 'device unignored'})
+    
+    @action(detail=False, methods=['post'])
+    def bulk_ignore(self, request):
+        """Ignore (or with is_ignored=false, unignore) many devices in one UPDATE"""
+        device_ids = request.data.get('ids')
+        is_ignored = request.data.get('is_ignored', True)
+        
+        if not isinstance(device_ids, list) or len(device_ids) > MAX_BULK_DEVICE_IDS or not isinstance(is_ignored, bool):
+            return Response(
+                {'error': f'ids must be a list of at most {MAX_BULK_DEVICE_IDS} device ids and is_ignored a boolean'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            device_ids = [uuid.UUID(str(device_id)) for device_id in device_ids]
+        except ValueError:
+            return Response({'error': 'Invalid device id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        updated = self.get_queryset().filter(id__in=device_ids).update(
+            is_ignored=is_ignored,
+            updated_at=timezone.now()
+        )
+        return Response({'updated': updated})
 
 
 class NetworkConnectionViewSet(viewsets.ModelViewSet):
     """API endpoint for network connections"""
-    queryset = NetworkConnection.objects.all().order_by('-updated_at')
+    queryset = NetworkConnection.objects.select_related('source', 'target').order_by('-updated_at')
     serializer_class = NetworkConnectionSerializer
     permission_classes = [IsAuthenticated]
     
@@ -71,6 +128,7 @@ class NetworkScanViewSet(viewsets.ModelViewSet):
     """API endpoint for network scans"""
     queryset = NetworkScan.objects.all().order_by('-timestamp')
     serializer_class = NetworkScanSerializer
+    pagination_class = TimestampCursorPagination
     permission_classes = [IsAuthenticated]
     
     @action(detail=False, methods=['post'])
@@ -79,12 +137,14 @@ class NetworkScanViewSet(viewsets.ModelViewSet):
         Clean up any stale in-progress network scans.
         This is useful after a server restart or when a scan gets stuck.
         """
-        import asyncio
-        from ..services.network_scanner import cleanup_stale_jobs, get_active_scans
+        async def cleanup():
+            # Count active scans only after the stale ones are gone
+            cleaned = await cleanup_stale_jobs()
+            return cleaned, await get_active_scans()
         
-        # Run async functions within a synchronous view
-        cleaned = asyncio.run(cleanup_stale_jobs())
-        active_scans = asyncio.run(get_active_scans())
+        # Run both steps in one trip to the shared background loop, where
+        # the scanner's jobs live
+        cleaned, active_scans = background_loop.run(cleanup())
         active = len(active_scans)
         
         return Response({
@@ -105,9 +165,6 @@ class NetworkScanViewSet(viewsets.ModelViewSet):
         )
         
         # Start the scan process asynchronously
-        import asyncio
-        from ..services.network_scanner import ScanOptions, ScanType, start_scan
-        
         async def run_scan():
             try:
                 # Create scan options with the IP range
@@ -116,25 +173,20 @@ class NetworkScanViewSet(viewsets.ModelViewSet):
                     ip_range=ip_range
                 )
                 
-                # Start the scan and store the job_id in the scan record
-                scan_job = await start_scan(options, user_id=request.user.id)
-                
-                # Update the scan record with the job_id
-                scan.job_id = scan_job.id
-                scan.save()
+                # Start the scan; the scanner runs it as a task on this loop
+                await start_scan(options)
                 
             except Exception as e:
-                # Update scan record if there's an error
-                scan.status = 'failed'
-                scan.error_message = str(e)
-                scan.save()
+                logger.error(f"Failed to start network scan {scan.pk}: {str(e)}")
+                
+                # Update scan record if there's an error (the ORM is sync-only)
+                await sync_to_async(NetworkScan.objects.filter(pk=scan.pk).update)(
+                    status='failed',
+                    error_message=str(e)
+                )
         
-        # Run the async function in a thread to not block the Django view
-        import threading
-        threading.Thread(
-            target=lambda: asyncio.run(run_scan()),
-            daemon=True
-        ).start()
+        # Hand the coroutine to the shared background loop so the view doesn't block
+        background_loop.submit(run_scan())
         
         return Response({
             'status': 'success',
@@ -157,28 +209,29 @@ class NetworkScanViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def network_topology(request):
-    """Get the full network topology"""
+    """
+    Get the full network topology
+    
+    Rows come straight from .values() instead of going through the nested
+    NetworkTopologySerializer; the rendered JSON has the same shape.
+    """
     # Get devices that are not ignored
     devices = NetworkDevice.objects.filter(is_ignored=False).order_by('-last_seen')
     
-    # Get connections between these devices
-    device_ids = [device.id for device in devices]
+    # Get connections between these devices; passing the id queryset keeps
+    # it a subquery instead of materializing every device in Python. Only
+    # the source/target ids are returned, so no join is needed
+    device_ids = devices.values_list('id', flat=True)
     connections = NetworkConnection.objects.filter(
-        source__id__in=device_ids,
-        target__id__in=device_ids
-    ).select_related('source', 'target')
+        source_id__in=device_ids,
+        target_id__in=device_ids
+    )
     
     # Get latest scan
-    latest_scan = NetworkScan.objects.filter(status='completed').order_by('-timestamp').first()
-    
-    # Prepare data for serialization
-    topology_data = {
-        'devices': devices,
-        'connections': connections,
-        'lastScan': latest_scan
-    }
-    
-    # Serialize the data
-    serializer = NetworkTopologySerializer(topology_data)
+    latest_scan = NetworkScan.objects.filter(status='completed').order_by('-timestamp')
     
-    return Response(serializer.data)
+    return Response({
+        'devices': list(devices.values(*DEVICE_FIELDS)),
+        'connections': list(connections.values(*CONNECTION_FIELDS)),
+        'lastScan': latest_scan.values(*SCAN_FIELDS).first()
+    })
@@ -2,6 +2,7 @@
 Network tools API endpoints for the GearRoom feature.
 This module provides real-world network diagnostics through API endpoints.
 """
+import asyncio
 import subprocess
 import re
 import socket
@@ -9,29 +10,53 @@ import ssl
 import json
 import ipaddress
 import time
+import threading
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 
 # Maximum command execution time in seconds
 MAX_EXECUTION_TIME = 30
 
+# Characters stripped from user input, and the URL scheme removed for SSL checks
+SANITIZE_PATTERN = re.compile(r'[^\w\.\-:/]')
+URL_SCHEME_PATTERN = re.compile(r'^https?://')
+
+# Tool commands block the worker thread serving the request for up to
+# MAX_EXECUTION_TIME. Cap how many run at once so slow diagnostics can't
+# take every thread away from the rest of the API.
+MAX_CONCURRENT_COMMANDS = 4
+_command_slots = threading.BoundedSemaphore(MAX_CONCURRENT_COMMANDS)
+
+# Seconds clients are told to wait (Retry-After) when every slot is taken
+COMMAND_RETRY_AFTER = 5
+COMMANDS_BUSY_MESSAGE = "Too many network tools are running; please try again shortly"
+
 def sanitize_input(input_str):
     """
     Sanitize user input to prevent command injection.
     Remove special characters and limit to alphanumeric, dots, hyphens, and slashes.
     """
     # Allow alphanumeric, dots, hyphens, underscores, colons and limited special chars
-    sanitized = re.sub(r'[^\w\.\-:/]', '', input_str)
+    sanitized = SANITIZE_PATTERN.sub('', input_str)
     return sanitized
 
 def execute_command(command, timeout=MAX_EXECUTION_TIME):
     """
     Execute a system command safely and return the output.
+    
+    Raises Throttled (429 with Retry-After) when MAX_CONCURRENT_COMMANDS
+    commands are already running, so overload isn't reported as a failed command.
     """
+    # Don't queue behind long-running tools; tell the client to retry instead
+    if not _command_slots.acquire(blocking=False):
+        raise Throttled(wait=COMMAND_RETRY_AFTER, detail=COMMANDS_BUSY_MESSAGE)
+    
     try:
         result = subprocess.run(
             command,
@@ -65,6 +90,137 @@ def execute_command(command, timeout=MAX_EXECUTION_TIME):
             'status': 'error',
             'timestamp': timezone.now().isoformat()
         }
+    finally:
+        _command_slots.release()
+
+async def _iter_command_output(command, timeout):
+    """
+    Run a command and yield its combined stdout/stderr line by line as it is produced.
+    
+    This is an async generator so that, under ASGI, Django sends each line
+    as it arrives; a sync generator would be drained into a list first.
+    """
+    # Acquired on the first read, so a response that is never consumed can't hold a slot
+    if not _command_slots.acquire(blocking=False):
+        yield f"{COMMANDS_BUSY_MESSAGE}\n"
+        return
+    
+    try:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+        except Exception as e:
+            yield f"Failed to execute command: {str(e)}\n"
+            return
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        timed_out = False
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(process.stdout.readline(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    break
+                if not line:
+                    break
+                yield line.decode(errors='replace')
+        finally:
+            # Also reached when the client disconnects and the stream is cancelled or closed
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
+        
+        if timed_out:
+            yield f"Command timed out after {timeout} seconds\n"
+    finally:
+        _command_slots.release()
+
+def stream_command(command, timeout=MAX_EXECUTION_TIME):
+    """
+    Execute a system command and stream its output to the client as plain text.
+    
+    Long-running tools send each line as soon as it is printed instead of
+    holding the whole output in memory until the command exits. Answers 429
+    up front when every command slot is already taken.
+    """
+    if not _command_slots.acquire(blocking=False):
+        raise Throttled(wait=COMMAND_RETRY_AFTER, detail=COMMANDS_BUSY_MESSAGE)
+    # The generator takes its own slot once the response is consumed
+    _command_slots.release()
+    
+    return StreamingHttpResponse(
+        _iter_command_output(command, timeout),
+        content_type='text/plain; charset=utf-8'
+    )
+
+def wants_stream(request):
+    """
+    Whether the client asked for streamed plain-text output instead of the JSON result
+    """
+    value = request.data.get('stream', False)
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+def _format_x509_name(name):
+    """Flatten a getpeercert() subject/issuer into 'CN=..., O=...' form"""
+    short_names = {
+        'commonName': 'CN',
+        'organizationName': 'O',
+        'organizationalUnitName': 'OU',
+        'countryName': 'C',
+        'stateOrProvinceName': 'ST',
+        'localityName': 'L',
+    }
+    return ', '.join(
+        f"{short_names.get(key, key)}={value}"
+        for rdn in name
+        for key, value in rdn
+    )
+
+def describe_ssl_certificate(host, port=443, timeout=10):
+    """
+    Connect to host:port over TLS and describe the verified server certificate.
+    
+    Returns the description as 'Label: value' lines, which the frontend SSL
+    output parser understands. Raises ssl.SSLCertVerificationError if the
+    certificate doesn't verify, or OSError if the connection fails.
+    """
+    context = ssl.create_default_context()
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        with context.wrap_socket(sock, server_hostname=host) as tls:
+            cert = tls.getpeercert()
+            protocol = tls.version()
+            cipher = tls.cipher()
+    
+    days_left = int((ssl.cert_time_to_seconds(cert['notAfter']) - time.time()) // 86400)
+    alt_names = ', '.join(f"{kind}:{value}" for kind, value in cert.get('subjectAltName', ()))
+    
+    lines = [
+        f"Server: {host}:{port}",
+        f"Subject: {_format_x509_name(cert.get('subject', ()))}",
+        f"Issuer: {_format_x509_name(cert.get('issuer', ()))}",
+        f"Serial Number: {cert.get('serialNumber', '')}",
+        f"Valid From: {cert['notBefore']}",
+        f"Valid To: {cert['notAfter']}",
+        f"Days Left: {days_left}",
+    ]
+    if alt_names:
+        lines.append(f"Subject Alternative Names: {alt_names}")
+    lines.append(f"Protocol: {protocol}")
+    if cipher:
+        lines.append(f"Cipher Suite: {cipher[0]}")
+    lines.append("Verification: OK")
+    
+    return '\n'.join(lines)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -81,8 +237,10 @@ def ping_tool(request):
     # Sanitize input
     target = sanitize_input(target)
     
-    # Run ping command with limited options for security
-    command = ['ping', '-c', '4', target]
+    # Run ping command with limited options for security. Probes go out
+    # every 0.2s (the unprivileged minimum) with a 1s reply timeout, so the
+    # worker is held for about a second instead of 3+ at ping's defaults
+    command = ['ping', '-c', '4', '-i', '0.2', '-W', '1', target]
     result = execute_command(command)
     
     return Response(result)
@@ -104,6 +262,9 @@ def nmap_tool(request):
     
     # Run nmap with basic options (safe scan)
     command = ['nmap', '-sT', '-T3', '--top-ports', '100', target]
+    if wants_stream(request):
+        return stream_command(command)
+    
     result = execute_command(command)
     
     return Response(result)
@@ -169,6 +330,9 @@ def traceroute_tool(request):
     
     # Run traceroute command
     command = ['traceroute', '-m', '15', target]
+    if wants_stream(request):
+        return stream_command(command)
+    
     result = execute_command(command)
     
     return Response(result)
@@ -210,7 +374,25 @@ def ssl_check_tool(request):
     target = sanitize_input(target)
     
     # Remove any protocol prefix if present
-    target = re.sub(r'^https?://', '', target)
+    target = URL_SCHEME_PATTERN.sub('', target)
+    
+    # Do the TLS handshake in-process; a verified certificate is all we need
+    try:
+        return Response({
+            'output': describe_ssl_certificate(target),
+            'status': 'success',
+            'timestamp': timezone.now().isoformat()
+        })
+    except ssl.SSLCertVerificationError:
+        # Python only exposes certificate details once they verify, so let
+        # OpenSSL show what is wrong with an invalid certificate
+        pass
+    except (OSError, ValueError) as e:
+        return Response({
+            'output': f"Error: could not connect to {target}:443: {str(e)}",
+            'status': 'error',
+            'timestamp': timezone.now().isoformat()
+        })
     
     # Use OpenSSL to get certificate info
     command = ['openssl', 's_client', '-connect', f"{target}:443", '-servername', target, '-showcerts']
@@ -266,12 +448,15 @@ def tcpdump_tool(request):
     except (ValueError, TypeError):
         count = 25  # Default if invalid
     
-    # Build command with safe options
-    command = ['tcpdump', '-i', interface, '-c', str(count), '-n']
+    # Build command with safe options (-l line-buffers packets so they can be streamed)
+    command = ['tcpdump', '-i', interface, '-c', str(count), '-n', '-l']
     
     if filter_expr:
         command.extend(filter_expr.split())
     
+    if wants_stream(request):
+        return stream_command(command)
+    
     result = execute_command(command)
     
     return Response(result)
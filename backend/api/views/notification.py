@@ -1,15 +1,20 @@
 """
 Notification views for the everyst API.
 """
+import uuid
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
 from django.utils import timezone
 
 from api.models.notification import Notification
 from api.serializers.notification import NotificationSerializer
+from api.pagination import TimestampCursorPagination
+
+# Upper bound on the ids accepted by a single mark_as_read call
+MAX_MARK_AS_READ_IDS = 500
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -18,15 +23,14 @@ class NotificationViewSet(viewsets.ModelViewSet):
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
     
     def get_queryset(self):
         """
         Return notifications for the current user and system notifications
         """
         user = self.request.user
-        return Notification.objects.filter(
-            Q(user=user) | Q(is_system=True)
-        ).order_by('-timestamp')
+        return Notification.visible_to(user).order_by('-timestamp')
     
     def perform_create(self, serializer):
         """When creating a notification, associate it with the current user"""
@@ -39,11 +43,20 @@ class NotificationViewSet(viewsets.ModelViewSet):
             notification_ids = request.data.get('ids', [])
             user = request.user
             
-            # Update notifications that belong to this user or are system notifications
-            updated = Notification.objects.filter(
-                Q(id__in=notification_ids),
-                Q(user=user) | Q(is_system=True)
-            ).update(is_read=True)
+            if not isinstance(notification_ids, list) or len(notification_ids) > MAX_MARK_AS_READ_IDS:
+                return Response(
+                    {'error': f'ids must be a list of at most {MAX_MARK_AS_READ_IDS} notification ids'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Validate the ids up front instead of letting the query cast them
+            notification_ids = [uuid.UUID(str(notification_id)) for notification_id in notification_ids]
+            
+            # Mark notifications that belong to this user or are system notifications
+            updated = Notification.mark_read_for(
+                user,
+                Notification.visible_to(user).filter(id__in=notification_ids)
+            )
             
             return Response({'updated': updated}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -55,11 +68,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
         try:
             user = request.user
             
-            # Update notifications that belong to this user or are system notifications
-            updated = Notification.objects.filter(
-                Q(user=user) | Q(is_system=True),
-                is_read=False
-            ).update(is_read=True)
+            # Mark notifications that belong to this user or are system
+            # notifications; system ones only become read for this user
+            updated = Notification.mark_read_for(user, Notification.visible_to(user))
             
             return Response({'updated': updated}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -72,10 +83,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             user = request.user
             
             # Count notifications that belong to this user or are system notifications
-            unread_count = Notification.objects.filter(
-                Q(user=user) | Q(is_system=True),
-                is_read=False
-            ).count()
+            unread_count = Notification.unread_count_for(user)
             
             return Response({'count': unread_count}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -89,8 +97,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             seven_days_ago = timezone.now() - timezone.timedelta(days=7)
             
             # Get recent notifications
-            notifications = Notification.objects.filter(
-                Q(user=user) | Q(is_system=True),
+            notifications = Notification.visible_to(user).filter(
                 timestamp__gte=seven_days_ago
             ).order_by('-timestamp')[:10]
             
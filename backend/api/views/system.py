@@ -1,14 +1,27 @@
 """
 System-related views for the everyst API.
 """
+import threading
+
+from django.core.cache import cache
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 
 from api.models.system import SystemMetrics, Alert, SecurityStatus
 from api.serializers.system import SystemMetricsSerializer, AlertSerializer, SecurityStatusSerializer
-from api.utils import get_system_metrics
+from api.renderers import ORJSONRenderer
+from api.pagination import TimestampCursorPagination
+
+# Dashboards poll the current metrics several times a second; a sample is
+# shared by every request made within this many seconds
+CURRENT_METRICS_CACHE_KEY = 'system:current_metrics'
+CURRENT_METRICS_TTL = 1
+
+# Lets only one request collect a new sample while the others wait for it
+_current_metrics_lock = threading.Lock()
 
 
 class SystemMetricsViewSet(viewsets.ReadOnlyModelViewSet):
@@ -18,6 +31,25 @@ class SystemMetricsViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = SystemMetrics.objects.all().order_by('-timestamp')
     serializer_class = SystemMetricsSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List metrics as plain dicts straight from the database.
+        
+        Metrics rows are flat, so the list skips model instances and the
+        serializer entirely; the output matches SystemMetricsSerializer.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *SystemMetricsSerializer.Meta.fields
+        )
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+        
+        return Response(list(queryset))
 
 
 class AlertViewSet(viewsets.ModelViewSet):
@@ -27,6 +59,7 @@ class AlertViewSet(viewsets.ModelViewSet):
     queryset = Alert.objects.all().order_by('-timestamp')
     serializer_class = AlertSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
 
 
 class SecurityStatusViewSet(viewsets.ReadOnlyModelViewSet):
@@ -36,13 +69,34 @@ class SecurityStatusViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = SecurityStatus.objects.all().order_by('-timestamp')
     serializer_class = SecurityStatusSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_current_metrics(request):
     """
-    Get the current system metrics
+    Get the current system metrics, sampled at most once per CURRENT_METRICS_TTL
     """
-    metrics = get_system_metrics()
+    metrics = cache.get(CURRENT_METRICS_CACHE_KEY)
+    if metrics is None:
+        with _current_metrics_lock:
+            # Another request may have collected a sample while we waited
+            metrics = cache.get(CURRENT_METRICS_CACHE_KEY)
+            if metrics is None:
+                # Imported on first use so loading the URLconf doesn't pull in psutil
+                from api.utils import get_system_metrics
+                metrics = get_system_metrics()
+                cache.set(CURRENT_METRICS_CACHE_KEY, metrics, CURRENT_METRICS_TTL)
     return Response(metrics)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def server_info(request):
+    """
+    Get static server information (hostname, IPs, OS).
+    Kept out of the metrics payload since it doesn't change between samples.
+    """
+    from api.utils import get_server_info
+    return Response(get_server_info())
@@ -1,18 +1,54 @@
 """
 User management views for the everyst API.
 """
+import hashlib
+
 from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_GET
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated
 
 from api.serializers.user import UserSerializer, UserRoleSerializer
 from api.models.role import UserRole
 from api.permissions import CanManageUsers
+from api.permissions.access_permissions import get_request_role, is_user_manager
+from api.utils.auth import ausers_exist, user_count
 
 User = get_user_model()
 
+# (is_staff, is_superuser) granted by each role; any other role gets neither
+ROLE_FLAGS = {
+    'owner': (True, True),
+    'admin': (True, False),
+}
+
+def _me_etag(request):
+    """
+    ETag for the current user's profile, built from the already-loaded user and role
+    
+    Covers every field UserSerializer renders, so the tag changes whenever
+    the /users/me/ payload would.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return None
+    
+    role = get_request_role(request)
+    parts = (
+        user.pk, user.username, user.email, user.first_name, user.last_name,
+        user.is_active, user.date_joined, user.last_login, user.profile_image.name,
+        user.role_id, user.is_staff, user.is_superuser,
+        role and (role.description, role.priority, role.can_manage_users,
+                  role.can_manage_system, role.can_manage_network, role.can_view_all_data),
+    )
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
 class UserRoleViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for user roles
@@ -36,7 +72,8 @@ class UserViewSet(viewsets.ModelViewSet):
     """
     API endpoint for users
     """
-    queryset = User.objects.all()
+    # role_details is rendered for every user, so the role is always joined in
+    queryset = User.objects.select_related('role').all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     
@@ -44,18 +81,16 @@ class UserViewSet(viewsets.ModelViewSet):
         """Only allow users to see their own profile unless they have permissions"""
         user = self.request.user
         
-        # Check if user has role and permissions
-        if hasattr(user, 'role') and user.role:
-            # System owners or admins can see all users
-            if user.role.name in ['owner', 'admin'] or user.is_staff or user.is_superuser:
-                return User.objects.all()
-            
-            # Users with manage_users permission can see all users
-            if user.role.can_manage_users:
-                return User.objects.all()
+        # Check if user has role and permissions (the role is loaded once per
+        # request and shared with the permission classes)
+        if get_request_role(self.request) is not None:
+            # Owners, admins and anyone whose role can manage users see all users,
+            # as do staff and superusers
+            if is_user_manager(self.request) or user.is_staff or user.is_superuser:
+                return User.objects.select_related('role').all()
         
         # Regular users can only see themselves
-        return User.objects.filter(id=user.id)
+        return User.objects.filter(id=user.id).select_related('role')
     
     def get_permissions(self):
         """
@@ -66,13 +101,29 @@ class UserViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated()]
         elif self.action in ['create', 'update', 'partial_update', 'destroy', 'set_role']:
             # Only users who can manage users can modify
-            from api.permissions import CanManageUsers
             return [IsAuthenticated(), CanManageUsers()]
         return super().get_permissions()
     
+    def retrieve(self, request, *args, **kwargs):
+        """Serve the caller's own profile from the already-authenticated user"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if str(kwargs.get(lookup_url_kwarg)) == str(request.user.pk):
+            serializer = self.get_serializer(request.user)
+            return Response(serializer.data)
+        
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=False, methods=['get'])
+    @method_decorator(cache_control(private=True, no_cache=True))
+    @method_decorator(etag(_me_etag))
     def me(self, request):
-        """Return the current user's profile"""
+        """
+        Return the current user's profile
+        
+        Browsers revalidate with If-None-Match on every load and get a 304
+        until the profile changes.
+        """
+        # role_details reuses the role the ETag already loaded onto the user
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
         
@@ -83,7 +134,6 @@ class UserViewSet(viewsets.ModelViewSet):
         
         # If trying to create a new owner, check if one already exists
         if (role_name == 'owner'):
-            from api.models.role import UserRole
             # Check if there's already an owner
             existing_owner = User.objects.filter(role__name='owner').exists()
             if existing_owner:
@@ -98,8 +148,6 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def set_role(self, request, pk=None):
         """Set the role for a user"""
-        from api.models.role import UserRole
-        
         user = self.get_object()
         role_name = request.data.get('role')
         
@@ -109,18 +157,22 @@ class UserViewSet(viewsets.ModelViewSet):
         
         try:
             # Get the requested role
-            role = UserRole.objects.get(name=role_name)
+            role = UserRole.get_cached(role_name)
+            
+            # The role's name is its primary key, so role_id is the role name
+            # and reading it doesn't load the role from the database
+            current_role = request.user.role_id
             
             # Check if current user is trying to set a higher privileged role
             # Only owners can create other owners
-            if role.name == 'owner' and request.user.role.name != 'owner':
+            if role.name == 'owner' and current_role != 'owner':
                 return Response(
                     {"detail": "Only owners can assign the owner role"}, 
                     status=status.HTTP_403_FORBIDDEN
                 )
             
             # Only owners and admins can create admins
-            if role.name == 'admin' and request.user.role.name not in ['owner', 'admin']:
+            if role.name == 'admin' and current_role not in ['owner', 'admin']:
                 return Response(
                     {"detail": "Only owners and admins can assign the admin role"}, 
                     status=status.HTTP_403_FORBIDDEN
@@ -143,7 +195,7 @@ class UserViewSet(viewsets.ModelViewSet):
                     )
             
             # Check if we're demoting the system owner and ensure there's another owner first
-            if user.role and user.role.name == 'owner' and role.name != 'owner':
+            if user.role_id == 'owner' and role.name != 'owner':
                 # If trying to demote the current owner, ensure there's another owner first
                 other_owner = User.objects.filter(role__name='owner').exclude(id=user.id).exists()
                 if not other_owner:
@@ -156,17 +208,9 @@ class UserViewSet(viewsets.ModelViewSet):
             user.role = role
             
             # Update is_staff and is_superuser flags based on role
-            if role.name == 'owner':
-                user.is_staff = True
-                user.is_superuser = True
-            elif role.name == 'admin':
-                user.is_staff = True
-                user.is_superuser = False
-            else:
-                user.is_staff = False
-                user.is_superuser = False
-                
-            user.save()
+            user.is_staff, user.is_superuser = ROLE_FLAGS.get(role.name, (False, False))
+            
+            user.save(update_fields=['role', 'is_staff', 'is_superuser'])
             
             # Return updated user data
             serializer = self.get_serializer(user)
@@ -200,7 +244,7 @@ class UserViewSet(viewsets.ModelViewSet):
         
         # Update the password
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password'])
         
         return Response({"detail": "Password changed successfully"}, status=status.HTTP_200_OK)
     
@@ -255,9 +299,10 @@ class UserViewSet(viewsets.ModelViewSet):
             if user.profile_image:
                 user.profile_image.delete(save=False)
             
-            # Save new profile image
+            # Save new profile image; the storage writes the upload in chunks,
+            # and only the image column is updated
             user.profile_image = image
-            user.save()
+            user.save(update_fields=['profile_image'])
             
             return Response({
                 "detail": "Profile image updated successfully",
@@ -271,16 +316,15 @@ def check_users_exist(request):
     This endpoint is used during initial setup but requires authentication.
     """
     if request.user.is_authenticated:
-        user_count = User.objects.count()
+        count = user_count()
         return Response({
-            'users_exist': user_count > 0,
-            'user_count': user_count
+            'users_exist': count > 0,
+            'user_count': count
         })
     return Response({"detail": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def first_run_check(request):
+@require_GET
+async def first_run_check(request):
     """
     Minimal first run check endpoint that returns only status codes.
     200 OK: Users exist, should show login page
@@ -288,9 +332,13 @@ def first_run_check(request):
     
     This endpoint doesn't reveal any information about the system
     other than whether it has been set up or not.
+    
+    It is polled before login on every app load, and needs neither
+    authentication nor content negotiation, so it is a plain async Django
+    view. Under ASGI the whole middleware chain is async-capable, so it is
+    answered on the event loop without a worker thread.
     """
-    user_exists = User.objects.exists()
-    if user_exists:
-        return Response(status=status.HTTP_200_OK)
+    if await ausers_exist():
+        return HttpResponse(status=status.HTTP_200_OK)
     else:
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
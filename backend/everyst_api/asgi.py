@@ -80,10 +80,33 @@ django_application = ProtocolTypeRouter({
 })
 
 
-# Lifecycle management for background tasks
+# Lifecycle management for background tasks. Every long-running task is kept
+# here until it finishes, so shutdown can cancel and await all of them.
 background_tasks = set()
 metrics_task = None
-startup_complete = False
+
+def track_background_task(task):
+    """
+    Keep a reference to a background task until it finishes, logging any crash
+    """
+    background_tasks.add(task)
+    
+    def on_done(finished):
+        background_tasks.discard(finished)
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.error(f"Background task failed: {finished.exception()}")
+    
+    task.add_done_callback(on_done)
+    return task
+
+async def stop_background_tasks():
+    """
+    Cancel all tracked background tasks and wait for them to wind down
+    """
+    tasks = list(background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 async def startup_cleanup():
     """Reset scan states and clean up any stale data at startup"""
@@ -123,7 +146,7 @@ async def application(scope, receive, send):
     This routes requests to either Socket.IO or Django based on the path,
     with proper handling of background tasks and service initialization.
     """
-    global metrics_task, startup_complete
+    global metrics_task
     
     # Handle the lifespan protocol for ASGI startup/shutdown events
     if scope['type'] == 'lifespan':
@@ -131,11 +154,10 @@ async def application(scope, receive, send):
             message = await receive()
             if message['type'] == 'lifespan.startup':
                 # Initialize services on lifespan startup
-                if not startup_complete:
-                    startup_complete = True
+                if metrics_task is None:
                     try:
-                        # Start metrics broadcasting in background
-                        metrics_task = start_metrics_thread()
+                        # Start metrics broadcasting in background (a task on this event loop)
+                        metrics_task = track_background_task(start_metrics_thread())
                         logger.info("System metrics service started")
                         
                         # Schedule any other initialization tasks here
@@ -149,7 +171,8 @@ async def application(scope, receive, send):
             elif message['type'] == 'lifespan.shutdown':
                 # Cleanup on shutdown
                 logger.info("Shutting down ASGI application")
-                # Add any cleanup code here
+                await stop_background_tasks()
+                metrics_task = None
                 
                 # Send shutdown complete message
                 await send({'type': 'lifespan.shutdown.complete'})
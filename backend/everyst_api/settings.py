@@ -266,6 +266,24 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache Configuration
+# Login lockout counters live in the cache. Point CACHE_REDIS_URL at Redis
+# when running several workers so they share the counters.
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
 # Logging Configuration
 DEBUG_MODE = os.environ.get('DEBUG_MODE', 'False').lower() in ('true', '1', 'yes')
 
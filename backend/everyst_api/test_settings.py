@@ -0,0 +1,20 @@
+"""
+Django settings used when running the everyst API test suite.
+
+Extends the main settings with a faster, throwaway configuration.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Run tests against an in-memory SQLite database
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# PBKDF2 dominates create_user() time; a fast hasher is fine for tests
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
@@ -31,35 +31,6 @@ logger = logging.getLogger("server")
 
 # Load environment variables from .env file
 dotenv.load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
-import socket
-import logging
-from typing import Optional
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger('server')
-
-def get_local_ip() -> str:
-    """
-    Get the local IP address of the server.
-    
-    Returns:
-        str: Local IP address or fallback to "0.0.0.0" if detection fails
-    """
-    try:
-        # Create a socket to connect to an external service
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        # Doesn't need to be reachable
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
-    except Exception as e:
-        logger.warning(f"Failed to detect local IP: {e}")
-        return "0.0.0.0"  # fallback
 
 def parse_args() -> argparse.Namespace:
     """
@@ -106,13 +77,12 @@ if __name__ == "__main__":
         "port": port,
         "reload": dev_mode,
         "log_level": "debug" if debug_mode_env else "info",  # Use DEBUG_MODE for log level
-        # Add headers for CORS with HTTPS
-        "headers": [
-            ("Access-Control-Allow-Origin", "*"),
-            ("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS"),
-            ("Access-Control-Allow-Headers", "Origin, Content-Type, Accept, Authorization, X-Request-With"),
-            ("Access-Control-Allow-Credentials", "true"),
-        ]
+        # uvloop and httptools are both in requirements.txt; uvloop isn't
+        # available on Windows, which keeps the asyncio loop
+        "loop": "asyncio" if sys.platform == "win32" else "uvloop",
+        "http": "httptools",
+        # CORS headers are added by the app itself: CorsMiddleware in asgi.py and
+        # django-cors-headers for HTTP, cors_allowed_origins for Socket.IO
     }
     
     # Add SSL configuration if enabled
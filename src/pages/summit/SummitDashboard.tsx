@@ -7,6 +7,7 @@ import { RefreshCw, Cpu, Server, HardDrive, Activity, Wifi, Shield, Plus, AlertT
 import { motion } from 'framer-motion';
 import { useWebSocket } from '../../context/WebSocketContext';
 import { socketService } from '../../utils/socket';
+import { createApiUrl } from '../../utils/apiUrl';
 
 // Types for raw metrics data received from backend
 interface RawMetricsData {
@@ -26,14 +27,6 @@ interface RawMetricsData {
     percentage: number;
     duration: string;
   };
-  server_info?: {
-    hostname: string;
-    private_ip: string;
-    public_ip: string;
-    os: string;
-    architecture: string;
-    kernel: string;
-  };
   security?: {
     status: 'успешно' | 'предупреждение' | 'ошибка';
     lastScan: string | null;
@@ -180,8 +173,6 @@ export const SummitDashboard: React.FC = () => {
         status: networkStatus,
       },
       uptime: data.uptime || null,
-      // Add server information if available
-      server_info: data.server_info || undefined,
     };
 
     return processed;
@@ -212,6 +203,30 @@ export const SummitDashboard: React.FC = () => {
     }, 800);
   };
   
+  // Server information is static, so fetch it once instead of with every metrics update
+  useEffect(() => {
+    const fetchServerInfo = async () => {
+      try {
+        const response = await fetch(createApiUrl('/system/server-info/'), {
+          headers: {
+            'Authorization': `Bearer ${localStorage.getItem('accessToken') || ''}`
+          }
+        });
+        if (!response.ok) return;
+        
+        const serverInfo = await response.json();
+        setMetrics((prevMetrics) => ({
+          ...prevMetrics,
+          server_info: serverInfo,
+        }));
+      } catch (error) {
+        console.error('Failed to fetch server info:', error);
+      }
+    };
+    
+    fetchServerInfo();
+  }, []);
+  
   // Set up metrics data listener
   useEffect(() => {
     if (!isConnected) {
@@ -259,7 +274,6 @@ export const SummitDashboard: React.FC = () => {
           status: 'success'
         },
         uptime: rawData.uptime || null,
-        server_info: rawData.server_info || undefined,
         security: null,
         threats: [],
         alerts: []